@@ -10,6 +10,8 @@ setup(
         "GitHubKit[auth-app]",
         "python-dotenv",
         "GitPython",
+        "orjson",
+        "h2",
     ],
     extras_require={
         "dev": ["flake8>=7.2.0"],
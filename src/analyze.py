@@ -21,7 +21,8 @@ from .functions import (
     should_scan_repository_for_GHAS_alerts,
     should_scan_repository_for_MCP_Composition,
     get_repository_properties,
-    log_separator
+    log_separator,
+    _format_secret_types_for_storage
 )
 from .github import (
     get_github_client,
@@ -788,70 +789,6 @@ def detect_runtime_from_package_files(local_repo_path: Path) -> Dict:
     return {}
 
 
-def _format_secret_types_for_storage(secret_types_dict):
-    """
-    Format secret types dictionary for safe storage in GitHub custom properties.
-    Converts {"type1": 5, "type2": 3} to "type1:5,type2:3" to avoid JSON quote issues.
-
-    Args:
-        secret_types_dict (dict): Dictionary of secret types and their counts
-
-    Returns:
-        str: Formatted string safe for GitHub API
-    """
-    if not secret_types_dict:
-        return ""
-
-    formatted_pairs = []
-    for secret_type, count in secret_types_dict.items():
-        # Escape any colons or commas in the type name to avoid parsing issues
-        safe_type = str(secret_type).replace(":", "_COLON_").replace(",", "_COMMA_")
-        formatted_pairs.append(f"{safe_type}:{count}")
-
-    return ",".join(formatted_pairs)
-
-
-def _parse_secret_types_from_storage(stored_value):
-    """
-    Parse secret types from stored format back to dictionary.
-    Converts "type1:5,type2:3" back to {"type1": 5, "type2": 3}.
-    Also handles legacy JSON format for backward compatibility.
-
-    Args:
-        stored_value (str): Stored secret types string
-
-    Returns:
-        dict: Dictionary of secret types and their counts
-    """
-    if not stored_value or stored_value == "":
-        return {}
-
-    # Handle legacy JSON format for backward compatibility
-    if stored_value.startswith("{") and stored_value.endswith("}"):
-        try:
-            import json
-            return json.loads(stored_value)
-        except json.JSONDecodeError:
-            logging.warning(f"Failed to parse legacy JSON secret types: [{stored_value}]")
-            return {}
-
-    # Parse new format: "type1:5,type2:3"
-    result = {}
-    try:
-        pairs = stored_value.split(",")
-        for pair in pairs:
-            if ":" in pair:
-                type_name, count_str = pair.split(":", 1)
-                # Unescape any escaped characters
-                type_name = type_name.replace("_COLON_", ":").replace("_COMMA_", ",")
-                result[type_name] = int(count_str)
-    except (ValueError, AttributeError) as e:
-        logging.warning(f"Failed to parse secret types from storage format: [{stored_value}], error: [{e}]")
-        return {}
-
-    return result
-
-
 def main():
     """Main execution function."""
     start_time = datetime.datetime.now()
@@ -886,116 +823,121 @@ def main():
         # --- Authentication ---
         gh = get_github_client(app_id, private_key)
 
-        # --- Load repositories and properties ---
-        logging.info(f"Loading repositories and properties for organization [{args.target_org}]...")
-        existing_repos = list_all_repositories_for_org(gh, args.target_org)
-        existing_repos_properties = list_all_repository_properties_for_org(gh, args.target_org)
-
-        # Initialize counters
-        total_repos = len(existing_repos)
-        scanned_repos = 0
-        skipped_repos = 0
-
-        # Initialize alert counters for total counts
-        total_code_alerts = 0
-        total_secret_alerts = 0
-        total_dependency_alerts = 0
-
-        # Initialize alert counters for severity breakdowns
-        total_code_alerts_by_severity = {
-            "critical": 0,
-            "high": 0,
-            "medium": 0,
-            "low": 0,
-        }
+        # Keep a single HTTP client (and its connection pool) open for all API calls
+        with gh:
+            # --- Load repositories and properties ---
+            logging.info(f"Loading repositories and properties for organization [{args.target_org}]...")
+            existing_repos = list_all_repositories_for_org(gh, args.target_org)
+            existing_repos_properties = list_all_repository_properties_for_org(gh, args.target_org)
+            existing_repos_properties_by_name = {
+                repo_properties.repository_name: repo_properties for repo_properties in existing_repos_properties
+            }
 
-        total_dependency_alerts_by_severity = {
-            "critical": 0,
-            "high": 0,
-            "moderate": 0,
-            "low": 0,
-        }
+            # Initialize counters
+            total_repos = len(existing_repos)
+            scanned_repos = 0
+            skipped_repos = 0
+
+            # Initialize alert counters for total counts
+            total_code_alerts = 0
+            total_secret_alerts = 0
+            total_dependency_alerts = 0
+
+            # Initialize alert counters for severity breakdowns
+            total_code_alerts_by_severity = {
+                "critical": 0,
+                "high": 0,
+                "medium": 0,
+                "low": 0,
+            }
 
-        # Track repositories where get_composition_info fails
-        failed_analysis_repos = []
+            total_dependency_alerts_by_severity = {
+                "critical": 0,
+                "high": 0,
+                "moderate": 0,
+                "low": 0,
+            }
 
-        logging.info(f"Found [{total_repos}] repositories in organization [{args.target_org}]")
+            # Track repositories where get_composition_info fails
+            failed_analysis_repos = []
 
-        github_token = os.getenv("GITHUB_TOKEN")
-        token_auth_gh = None
-        if github_token:
-            # Create a GitHub client authenticated with the token for issue creation
-            token_auth_gh = GitHub(github_token)
-            logging.info("Created GitHub client with token for issue creation if needed")
-        else:
-            logging.warning("GITHUB_TOKEN environment variable not set. Cannot create issues for analysis failures if needed.")
-
-        log_separator()
-
-        # Process repositories
-        for idx, repo in enumerate(existing_repos):
-            if scanned_repos >= args.num_repos:
-                logging.info(f"Reached scan limit of [{args.num_repos}] repositories.")
-                break
-
-            logging.info(f"Processing repository {scanned_repos + 1}/{min(total_repos, args.num_repos)}: {repo.name}")
-
-            # First, extract runtime information if possible
-            runtime = {}
-
-            # Get the default branch and GitHub token for cloning
-            fork_default_branch = repo.default_branch if repo else "main"
-            repo_properties = get_repository_properties(existing_repos_properties, repo, gh)
-
-            # todo: convert Constants.ScanSettings.GHAS_STATUS_UPDATED to a new field "LastUpdated" that reflects the last time the fork was updated
-            if should_scan_repository_for_MCP_Composition(repo_properties, Constants.ScanSettings.GHAS_STATUS_UPDATED, Constants.ScanSettings.SCAN_FREQUENCY_DAYS):
-                # clone the repo to a temp directory to check for MCP composition
-                local_repo_path = Path(f"tmp/{repo.name}")
-                clone_repository(gh, repo.owner.login, repo.name, fork_default_branch, local_repo_path)
-
-                # Scan repository for MCP composition
-                composition, scan_error = scan_repo_for_mcp_composition(local_repo_path)
-
-                # Extract runtime information if composition was found
-                if composition and not scan_error:
-                    logging.info(f"Found MCP composition in repository [{repo.name}]")
-                    try:
-                        runtime, analysis_error = get_composition_info(composition)
-                        if analysis_error or not runtime:
-                            error_msg = analysis_error.get("error_message", "Unknown error") if analysis_error else "Empty result from get_composition_info"
-                            logging.warning(f"Failed to analyze MCP composition for [{repo.name}]: {error_msg}")
-                            runtime = {}  # Set to empty dict if analysis failed
-                        else:
-                            scanned_repos += 1
-                            logging.info(f"MCP runtime info for [{repo.name}]: {runtime}")
-                    except Exception as e:
-                        logging.error(f"Error analyzing MCP composition for [{repo.name}]: {e}")
-                        runtime = {}  # Set to empty dict if exception occurred
-                elif scan_error:
-                    logging.error(f"Failed to scan MCP composition in repository [{repo.name}]: {scan_error.get('error_message', 'Unknown error')}")
-                    runtime = {}
-                else:
-                    logging.info(f"No MCP composition found in repository [{repo.name}]")
-                    runtime = detect_runtime_from_package_files(local_repo_path)
-                    if runtime:
-                        logging.info(f"Detected runtime from package files for [{repo.name}]: [{runtime}]")
+            logging.info(f"Found [{total_repos}] repositories in organization [{args.target_org}]")
+
+            github_token = os.getenv("GITHUB_TOKEN")
+            token_auth_gh = None
+            if github_token:
+                # Create a GitHub client authenticated with the token for issue creation
+                token_auth_gh = GitHub(github_token)
+                logging.info("Created GitHub client with token for issue creation if needed")
+            else:
+                logging.warning("GITHUB_TOKEN environment variable not set. Cannot create issues for analysis failures if needed.")
+
+            log_separator()
+
+            # Process repositories
+            for idx, repo in enumerate(existing_repos):
+                if scanned_repos >= args.num_repos:
+                    logging.info(f"Reached scan limit of [{args.num_repos}] repositories.")
+                    break
+
+                logging.info(f"Processing repository {scanned_repos + 1}/{min(total_repos, args.num_repos)}: {repo.name}")
+
+                # First, extract runtime information if possible
+                runtime = {}
+
+                # Get the default branch and GitHub token for cloning
+                fork_default_branch = repo.default_branch if repo else "main"
+                repo_properties = get_repository_properties(existing_repos_properties_by_name, repo, gh)
+
+                # todo: convert Constants.ScanSettings.GHAS_STATUS_UPDATED to a new field "LastUpdated" that reflects the last time the fork was updated
+                if should_scan_repository_for_MCP_Composition(repo_properties, Constants.ScanSettings.GHAS_STATUS_UPDATED, Constants.ScanSettings.SCAN_FREQUENCY_DAYS):
+                    # clone the repo to a temp directory to check for MCP composition
+                    local_repo_path = Path(f"tmp/{repo.name}")
+                    clone_repository(gh, repo.owner.login, repo.name, fork_default_branch, local_repo_path)
+
+                    # Scan repository for MCP composition
+                    composition, scan_error = scan_repo_for_mcp_composition(local_repo_path)
+
+                    # Extract runtime information if composition was found
+                    if composition and not scan_error:
+                        logging.info(f"Found MCP composition in repository [{repo.name}]")
+                        try:
+                            runtime, analysis_error = get_composition_info(composition)
+                            if analysis_error or not runtime:
+                                error_msg = analysis_error.get("error_message", "Unknown error") if analysis_error else "Empty result from get_composition_info"
+                                logging.warning(f"Failed to analyze MCP composition for [{repo.name}]: {error_msg}")
+                                runtime = {}  # Set to empty dict if analysis failed
+                            else:
+                                scanned_repos += 1
+                                logging.info(f"MCP runtime info for [{repo.name}]: {runtime}")
+                        except Exception as e:
+                            logging.error(f"Error analyzing MCP composition for [{repo.name}]: {e}")
+                            runtime = {}  # Set to empty dict if exception occurred
+                    elif scan_error:
+                        logging.error(f"Failed to scan MCP composition in repository [{repo.name}]: {scan_error.get('error_message', 'Unknown error')}")
+                        runtime = {}
                     else:
-                        logging.info(f"Could not detect runtime for [{repo.name}]")
-
-                # Handle composition analysis failures for issue creation
-                if scan_error:
-                    error_msg = scan_error.get("error_message", "Unknown error")
-                    # Add to failed analysis repos list
-                    failed_analysis_repos.append({
-                        "name": repo.name,
-                        "reason": error_msg,
-                        "file": os.path.basename(scan_error.get("filename", "unknown"))
-                    })
-
-                    # Create a GitHub issue for the failure if token is available
-                    if token_auth_gh:
-                        issue_title = f"Failed analysis: {error_msg}"
-                        issue_body = f"""
+                        logging.info(f"No MCP composition found in repository [{repo.name}]")
+                        runtime = detect_runtime_from_package_files(local_repo_path)
+                        if runtime:
+                            logging.info(f"Detected runtime from package files for [{repo.name}]: [{runtime}]")
+                        else:
+                            logging.info(f"Could not detect runtime for [{repo.name}]")
+
+                    # Handle composition analysis failures for issue creation
+                    if scan_error:
+                        error_msg = scan_error.get("error_message", "Unknown error")
+                        # Add to failed analysis repos list
+                        failed_analysis_repos.append({
+                            "name": repo.name,
+                            "reason": error_msg,
+                            "file": os.path.basename(scan_error.get("filename", "unknown"))
+                        })
+
+                        # Create a GitHub issue for the failure if token is available
+                        if token_auth_gh:
+                            issue_title = f"Failed analysis: {error_msg}"
+                            issue_body = f"""
 # MCP Composition Analysis Failure
 
 - **Repository**: {repo.name}
@@ -1008,108 +950,108 @@ def main():
 ```
                         """
 
-                        create_issue(token_auth_gh, args.target_org, "mcp-security-scans",
-                                     issue_title, issue_body, ["analysis-failure"])
+                            create_issue(token_auth_gh, args.target_org, "mcp-security-scans",
+                                         issue_title, issue_body, ["analysis-failure"])
 
-            # Now scan repository for GHAS alerts with runtime information
-            success, code_alerts, secret_alerts, dependency_alerts = scan_repository_for_alerts(gh, repo, repo_properties, runtime)
+                # Now scan repository for GHAS alerts with runtime information
+                success, code_alerts, secret_alerts, dependency_alerts = scan_repository_for_alerts(gh, repo, repo_properties, runtime)
 
-            if success:
-                scanned_repos += 1
+                if success:
+                    scanned_repos += 1
 
-                # Add alerts to totals if scan was successful
-                total_code_alerts += code_alerts["total"]
-                total_secret_alerts += secret_alerts["total"]
-                total_dependency_alerts += dependency_alerts["total"]
+                    # Add alerts to totals if scan was successful
+                    total_code_alerts += code_alerts["total"]
+                    total_secret_alerts += secret_alerts["total"]
+                    total_dependency_alerts += dependency_alerts["total"]
 
-                # Add alerts by severity
-                for severity in total_code_alerts_by_severity:
-                    total_code_alerts_by_severity[severity] += code_alerts.get(severity, 0)
+                    # Add alerts by severity
+                    for severity in total_code_alerts_by_severity:
+                        total_code_alerts_by_severity[severity] += code_alerts.get(severity, 0)
 
-                for severity in total_dependency_alerts_by_severity:
-                    total_dependency_alerts_by_severity[severity] += dependency_alerts.get(severity, 0)
+                    for severity in total_dependency_alerts_by_severity:
+                        total_dependency_alerts_by_severity[severity] += dependency_alerts.get(severity, 0)
+                else:
+                    skipped_repos += 1
+
+                log_separator()
+
+            # --- Generate summary ---
+            end_time = datetime.datetime.now()
+            duration = end_time - start_time
+
+            summary_lines = [
+                "**GHAS Alert Scanning Summary**",
+                "Security Scan Results",
+                f"- Organization: `{args.target_org}`",
+                f"- Total MCP server configs: `{total_repos}`",
+                f"- Total MCP servers found: `{total_repos}`",
+                f"- Scan limit (--num-repos): `{args.num_repos}`",
+                f"- Total repositories in organization: `{total_repos}`",
+                f"- Repositories processed: `{scanned_repos + skipped_repos}`",
+                f"- Repositories scanned: `{scanned_repos}`",
+                f"- Repositories skipped (not forks or recently scanned): `{skipped_repos}`",
+                f"- Total code scanning alerts found: `{total_code_alerts}`",
+                f"- Total secret scanning alerts found: `{total_secret_alerts}`",
+                f"- Total dependency vulnerability alerts found: `{total_dependency_alerts}`",
+                f"- Total GHAS alerts across all scanned repos: `{total_code_alerts + total_secret_alerts + total_dependency_alerts}`",
+                "",
+                "**Code Scanning Alerts by Severity**",
+                f"- Critical: `{total_code_alerts_by_severity['critical']}`",
+                f"- High: `{total_code_alerts_by_severity['high']}`",
+                f"- Medium: `{total_code_alerts_by_severity['medium']}`",
+                f"- Low: `{total_code_alerts_by_severity['low']}`",
+                "",
+                "**Dependency Scanning Alerts by Severity**",
+                f"- Critical: `{total_dependency_alerts_by_severity['critical']}`",
+                f"- High: `{total_dependency_alerts_by_severity['high']}`",
+                f"- Moderate: `{total_dependency_alerts_by_severity['moderate']}`",
+                f"- Low: `{total_dependency_alerts_by_severity['low']}`",
+                "",
+                "**Overall stats**",
+                f"- Total execution time: `{duration}`",
+                f"- Failed analysis repositories: `{len(failed_analysis_repos)}`"
+            ]
+
+            # Add a table with failed analysis repositories if any
+            if failed_analysis_repos:
+                summary_lines.append("")  # Add empty line for proper markdown rendering
+                summary_lines.append("**Failed Analysis Repositories**")
+                summary_lines.append("")
+                summary_lines.append("| Repository | File | Reason |")
+                summary_lines.append("| ---------- | ---- | ------ |")
+                for repo in failed_analysis_repos:
+                    file_name = repo.get('file', '')
+                    file_col = f" {file_name} " if file_name else " - "
+                    summary_lines.append(f"| {repo['name']} |{file_col}| {repo['reason']} |")
+                summary_lines.append("\n")
+
+            # Log summary to console
+            logging.info("Scanning Summary")
+            for line in summary_lines[1:]:  # Skip the markdown title for console
+                logging.info(line.replace('`', '').replace('*', ''))  # Clean markdown for console
+
+            # Log failed analysis repositories in a more readable format in console
+            if failed_analysis_repos:
+                logging.info("Failed Analysis Repositories:")
+                for repo in failed_analysis_repos:
+                    file_str = f" (file: {repo.get('file')})" if 'file' in repo else ""
+                    logging.info(f"1. {repo['name']}{file_str}: {repo['reason']}")
+
+            show_rate_limit(gh)
+
+            # Write summary to GITHUB_STEP_SUMMARY if available
+            summary_file_path = os.getenv("GITHUB_STEP_SUMMARY")
+            if summary_file_path:
+                try:
+                    with open(summary_file_path, "a") as summary_file:  # Append mode
+                        summary_file.write("\n".join(summary_lines) + "\n\n")
+                    logging.info(
+                        "Successfully appended summary to GITHUB_STEP_SUMMARY file"
+                    )
+                except Exception as e:
+                    logging.error(f"Failed to write to GITHUB_STEP_SUMMARY file: {e}")
             else:
-                skipped_repos += 1
-
-            log_separator()
-
-        # --- Generate summary ---
-        end_time = datetime.datetime.now()
-        duration = end_time - start_time
-
-        summary_lines = [
-            "**GHAS Alert Scanning Summary**",
-            "Security Scan Results",
-            f"- Organization: `{args.target_org}`",
-            f"- Total MCP server configs: `{total_repos}`",
-            f"- Total MCP servers found: `{total_repos}`",
-            f"- Scan limit (--num-repos): `{args.num_repos}`",
-            f"- Total repositories in organization: `{total_repos}`",
-            f"- Repositories processed: `{scanned_repos + skipped_repos}`",
-            f"- Repositories scanned: `{scanned_repos}`",
-            f"- Repositories skipped (not forks or recently scanned): `{skipped_repos}`",
-            f"- Total code scanning alerts found: `{total_code_alerts}`",
-            f"- Total secret scanning alerts found: `{total_secret_alerts}`",
-            f"- Total dependency vulnerability alerts found: `{total_dependency_alerts}`",
-            f"- Total GHAS alerts across all scanned repos: `{total_code_alerts + total_secret_alerts + total_dependency_alerts}`",
-            "",
-            "**Code Scanning Alerts by Severity**",
-            f"- Critical: `{total_code_alerts_by_severity['critical']}`",
-            f"- High: `{total_code_alerts_by_severity['high']}`",
-            f"- Medium: `{total_code_alerts_by_severity['medium']}`",
-            f"- Low: `{total_code_alerts_by_severity['low']}`",
-            "",
-            "**Dependency Scanning Alerts by Severity**",
-            f"- Critical: `{total_dependency_alerts_by_severity['critical']}`",
-            f"- High: `{total_dependency_alerts_by_severity['high']}`",
-            f"- Moderate: `{total_dependency_alerts_by_severity['moderate']}`",
-            f"- Low: `{total_dependency_alerts_by_severity['low']}`",
-            "",
-            "**Overall stats**",
-            f"- Total execution time: `{duration}`",
-            f"- Failed analysis repositories: `{len(failed_analysis_repos)}`"
-        ]
-
-        # Add a table with failed analysis repositories if any
-        if failed_analysis_repos:
-            summary_lines.append("")  # Add empty line for proper markdown rendering
-            summary_lines.append("**Failed Analysis Repositories**")
-            summary_lines.append("")
-            summary_lines.append("| Repository | File | Reason |")
-            summary_lines.append("| ---------- | ---- | ------ |")
-            for repo in failed_analysis_repos:
-                file_name = repo.get('file', '')
-                file_col = f" {file_name} " if file_name else " - "
-                summary_lines.append(f"| {repo['name']} |{file_col}| {repo['reason']} |")
-            summary_lines.append("\n")
-
-        # Log summary to console
-        logging.info("Scanning Summary")
-        for line in summary_lines[1:]:  # Skip the markdown title for console
-            logging.info(line.replace('`', '').replace('*', ''))  # Clean markdown for console
-
-        # Log failed analysis repositories in a more readable format in console
-        if failed_analysis_repos:
-            logging.info("Failed Analysis Repositories:")
-            for repo in failed_analysis_repos:
-                file_str = f" (file: {repo.get('file')})" if 'file' in repo else ""
-                logging.info(f"1. {repo['name']}{file_str}: {repo['reason']}")
-
-        show_rate_limit(gh)
-
-        # Write summary to GITHUB_STEP_SUMMARY if available
-        summary_file_path = os.getenv("GITHUB_STEP_SUMMARY")
-        if summary_file_path:
-            try:
-                with open(summary_file_path, "a") as summary_file:  # Append mode
-                    summary_file.write("\n".join(summary_lines) + "\n\n")
-                logging.info(
-                    "Successfully appended summary to GITHUB_STEP_SUMMARY file"
-                )
-            except Exception as e:
-                logging.error(f"Failed to write to GITHUB_STEP_SUMMARY file: {e}")
-        else:
-            logging.info("GITHUB_STEP_SUMMARY environment variable not set. Skipping summary file output.")
+                logging.info("GITHUB_STEP_SUMMARY environment variable not set. Skipping summary file output.")
 
     except Exception as e:
         logging.error(f"Script failed with an error: {e}")
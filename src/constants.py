@@ -69,6 +69,22 @@ class Constants:
         """Report-related constants"""
         REPORT_DIR = "reports"  # Directory to save reports
 
+    class Cache:
+        """Local cache related constants"""
+        CACHE_DIR = Path("./.cache")
+        HTTP_CACHE_PATH = CACHE_DIR / "gh_etag.sqlite"  # ETag cache for GitHub API responses
+        HTTP_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # Drop cached responses that were not revalidated for a week
+        KNOWN_MISSING_REPOS_PATH = CACHE_DIR / "known_missing_repos.json"  # Source repos that returned 404 when forking
+        KNOWN_MISSING_REPOS_TTL_DAYS = 30  # Retry missing source repos after a month, they might have been made public
+        PROCESSING_STATE_PATH = CACHE_DIR / "processing_state.sqlite"  # Forks processed by previous runs
+        REPROCESS_AFTER_DAYS = 7  # Same interval as the LastUpdated check in reprocess_repository
+
+    class RateLimit:
+        """GitHub API rate limit related constants"""
+        MAX_CONCURRENT_REQUESTS = 16  # GitHub allows at most 100 concurrent requests
+        POINTS_PER_MINUTE = 900  # Secondary rate limit for REST requests, see PointsThrottler for the point costs
+        RATE_LIMIT_RETRIES = 3  # Wait for the rate limit to reset and retry this many times before failing
+
 # For backward compatibility, define global constants with the same names
 # This allows existing code to continue working without changes, but
 # new code should use the class-based constants
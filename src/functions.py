@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
+import atexit
 import datetime
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict
 
+import orjson
+
 from .constants import Constants
 
 
@@ -213,7 +218,7 @@ def should_scan_repository_for_GHAS_alerts(properties: Dict[str, Any], timestamp
         return True
 
 
-def get_repository_properties(existing_repos_properties: list, repo, gh: Any) -> Dict[str, Any]:
+def get_repository_properties(existing_repos_properties_by_name: dict, repo, gh: Any) -> Dict[str, Any]:
 
     owner = repo.owner.login if repo.owner else Constants.Org.TARGET_ORG
     repo_name = repo.name
@@ -221,15 +226,13 @@ def get_repository_properties(existing_repos_properties: list, repo, gh: Any) ->
     # Get existing properties - fixed to handle the custom properties structure correctly
     properties = {}
     try:
-        # Search in the existing properties list
-        for repo_properties in existing_repos_properties:
-            # todo: there has to be a quicker way to do this then a for loop?
-            if (repo_properties.repository_name == repo_name):
-                # Extract properties from the custom properties object
-                for prop in repo_properties.properties:
-                    properties[prop.property_name] = prop.value
-                logging.info(f"Found existing custom properties for {owner}/{repo_name}")
-                break
+        # Look up the repository in the existing properties, keyed by repository name
+        repo_properties = existing_repos_properties_by_name.get(repo_name)
+        if repo_properties:
+            # Extract properties from the custom properties object
+            for prop in repo_properties.properties:
+                properties[prop.property_name] = prop.value
+            logging.info(f"Found existing custom properties for {owner}/{repo_name}")
 
         # If no properties found in the cached list, fetch directly
         if not properties:
@@ -248,6 +251,69 @@ def get_repository_properties(existing_repos_properties: list, repo, gh: Any) ->
         return {}
 
 
+def _format_secret_types_for_storage(secret_types_dict):
+    """
+    Format secret types dictionary for safe storage in GitHub custom properties.
+    Converts {"type1": 5, "type2": 3} to "type1:5,type2:3" to avoid JSON quote issues.
+
+    Args:
+        secret_types_dict (dict): Dictionary of secret types and their counts
+
+    Returns:
+        str: Formatted string safe for GitHub API
+    """
+    if not secret_types_dict:
+        return ""
+
+    formatted_pairs = []
+    for secret_type, count in secret_types_dict.items():
+        # Escape any colons or commas in the type name to avoid parsing issues
+        safe_type = str(secret_type).replace(":", "_COLON_").replace(",", "_COMMA_")
+        formatted_pairs.append(f"{safe_type}:{count}")
+
+    return ",".join(formatted_pairs)
+
+
+def _parse_secret_types_from_storage(stored_value):
+    """
+    Parse secret types from stored format back to dictionary.
+    Converts "type1:5,type2:3" back to {"type1": 5, "type2": 3}.
+    Also handles legacy JSON format for backward compatibility.
+
+    Args:
+        stored_value (str): Stored secret types string
+
+    Returns:
+        dict: Dictionary of secret types and their counts
+    """
+    if not stored_value or stored_value == "{}":
+        return {}
+
+    # Handle legacy JSON format for backward compatibility
+    if stored_value.startswith("{") and stored_value.endswith("}"):
+        try:
+            return orjson.loads(stored_value)
+        except orjson.JSONDecodeError:
+            logging.warning(f"Failed to parse legacy JSON secret types: [{stored_value}]")
+            return {}
+
+    # Parse new format: "type1:5,type2:3"
+    result = {}
+    try:
+        pairs = stored_value.split(",")
+        for pair in pairs:
+            if ":" in pair:
+                type_name, count_str = pair.split(":", 1)
+                # Unescape any escaped characters
+                type_name = type_name.replace("_COLON_", ":").replace("_COMMA_", ",")
+                result[type_name] = int(count_str)
+    except (ValueError, AttributeError) as e:
+        logging.warning(f"Failed to parse secret types from storage format: [{stored_value}], error: [{e}]")
+        return {}
+
+    return result
+
+
 def is_running_interactively() -> bool:
     """
     Determines if the script is running in an interactive environment.
@@ -271,3 +337,33 @@ def log_separator():
     Logs a separator line to visually separate log messages.
     """
     logging.info("------------------------------------------------------------")
+
+
+def configure_queued_logging(level: int = logging.INFO, format: str = '%(asctime)s - %(levelname)s - %(message)s') -> QueueListener | None:
+    """
+    Configures the root logger like logging.basicConfig, but writes the log records from a background thread.
+
+    Logging calls only put the record on a queue, so worker threads are not blocked on stderr writes.
+
+    Args:
+        level: The log level for the root logger.
+        format: The format string for the log records.
+
+    Returns:
+        The started QueueListener, or None if the root logger was already configured.
+    """
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return None
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(format))
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler)
+
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    listener.start()
+    # Flush the remaining records when the script exits
+    atexit.register(listener.stop)
+    return listener
@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 import re
@@ -5,23 +6,53 @@ import subprocess
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, Iterator
 
+import httpx
 from git import Repo, GitCommandError
 from githubkit import GitHub, AppInstallationAuthStrategy
-from githubkit.exception import RequestError, RequestFailed
+from githubkit.exception import GraphQLFailed, RequestError, RequestFailed
+from githubkit.retry import RETRY_SERVER_ERROR, RetryChainDecision, RetryRateLimit
 from githubkit.versions.latest.models import FullRepository
 import magic
 
+from .constants import Constants
 from .functions import is_running_interactively
+from .http_cache import SQLiteCacheStrategy
+from .rate_limit import PointsThrottler
 
+# Matches the owner and repository name of a GitHub URL, any trailing path (tree/main/...) is ignored
+GITHUB_URL_PATTERN = re.compile(r"[a-z][a-z0-9+.-]*://github\.com/+([^/?#]+)/+([^/?#]+)", re.IGNORECASE)
 
-def get_github_client(app_id: str, private_key: str) -> GitHub:
-    """Authenticates using GitHub App credentials."""
+
+def get_github_client(app_id: str, private_key: str, cache_path: Path | None = None, cache_ttl_seconds: float | None = None) -> GitHub:
+    """Authenticates using GitHub App credentials.
+
+    Args:
+        app_id: The GitHub App ID.
+        private_key: The GitHub App private key.
+        cache_path: Optional path to a SQLite file to persist the HTTP (ETag) cache across runs.
+                    The cache is kept in memory for this run only when not set.
+        cache_ttl_seconds: Optional maximum age of entries in the persisted HTTP cache.
+
+    Use the client as a context manager (`with gh:`) to reuse one HTTP/2 connection pool for all requests,
+    githubkit opens a new connection for every request otherwise.
+
+    All requests go through a PointsThrottler to stay under GitHub's secondary rate limit, and requests
+    that still hit a rate limit wait for it to reset and are retried.
+    """
     try:
         auth = AppInstallationAuthStrategy(app_id=int(app_id), private_key=private_key, installation_id=65023400)  # Note: Hardcoded installation ID might need review
-        gh = GitHub(auth)
+        client_options = {
+            "transport": httpx.HTTPTransport(http2=True, limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)),
+            "throttler": PointsThrottler(Constants.RateLimit.MAX_CONCURRENT_REQUESTS, Constants.RateLimit.POINTS_PER_MINUTE),
+            "auto_retry": RetryChainDecision(RetryRateLimit(max_retry=Constants.RateLimit.RATE_LIMIT_RETRIES), RETRY_SERVER_ERROR),
+        }
+        if cache_path:
+            gh = GitHub(auth, cache_strategy=SQLiteCacheStrategy(cache_path, cache_ttl_seconds), **client_options)
+            logging.info(f"Using persistent HTTP cache at [{cache_path}].")
+        else:
+            gh = GitHub(auth, **client_options)
         logging.info("GitHub client authenticated successfully as App.")
         return gh
     except ValueError as e:
@@ -90,17 +121,31 @@ def list_all_repository_properties_for_org(gh: GitHub, org: str) -> list[dict[st
         RequestFailed: If the API call fails.
         Exception: For other unexpected errors.
     """
-    all_properties = []
+    all_properties = list(iter_repository_properties_for_org(gh, org))
+    logging.info(f"Successfully fetched [{len(all_properties)}] custom repository properties for organization [{org}].")
+    return all_properties
+
+
+def iter_repository_properties_for_org(gh: GitHub, org: str) -> Iterator[Any]:
+    """Yields the custom repository properties of an organization one repository at a time.
+
+    Pages are fetched while the results are consumed, so only one page is kept in memory.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        org: The name of the GitHub organization.
+
+    Yields:
+        The custom property values of one repository.
+
+    Raises:
+        RequestFailed: If the API call fails.
+        Exception: For other unexpected errors.
+    """
     logging.info(f"Fetching all custom repository properties for organization [{org}]...")
     try:
-        paginated_properties = gh.paginate(gh.rest.orgs.custom_properties_for_repos_get_organization_values, org=org)
-
         # iterate through the paginated results
-        for prop in paginated_properties:
-            all_properties.append(prop)
-
-        logging.info(f"Successfully fetched [{len(all_properties)}] custom repository properties for organization [{org}].")
-        return all_properties
+        yield from gh.paginate(gh.rest.orgs.custom_properties_for_repos_get_organization_values, org=org)
 
     except RequestFailed as e:
         handle_github_api_error(e, f"listing all custom repository properties for org [{org}]")
@@ -147,12 +192,14 @@ def enable_ghas_features(gh: GitHub, owner: str, repo: str):
         logging.error(f"Unexpected error enabling GHAS features for [{owner}/{repo}]: [{e}]")
 
 
-def clone_or_update_repo(repo_url: str, local_path: Path) -> bool:
+def clone_or_update_repo(repo_url: str, local_path: Path, sparse_paths: list[str] | None = None) -> bool:
     """Clones a repository if it doesn't exist locally, or pulls updates if it does.
 
     Args:
         repo_url: URL of the repository to clone or update.
         local_path: Local path where the repository should be cloned to.
+        sparse_paths: Optional list of directories to check out. When set, the repository is cloned
+                      shallow, blobless and sparse, so only the files in these directories are downloaded.
 
     Returns:
         bool: True if the repository was newly cloned, False if it was updated.
@@ -164,7 +211,11 @@ def clone_or_update_repo(repo_url: str, local_path: Path) -> bool:
         try:
             repo = Repo(local_path)
             origin = repo.remotes.origin
-            origin.fetch()
+            if sparse_paths:
+                origin.fetch(depth=1)
+                repo.git.sparse_checkout('set', *sparse_paths)
+            else:
+                origin.fetch()
             # Resetting to remote's main/master branch - adjust branch name if needed
             # Trying common default branch names
             for branch_name in ['main', 'master']:
@@ -186,7 +237,11 @@ def clone_or_update_repo(repo_url: str, local_path: Path) -> bool:
     else:
         logging.info(f"Cloning repository from [{repo_url}] to [{local_path}]...")
         try:
-            Repo.clone_from(repo_url, local_path)
+            if sparse_paths:
+                repo = Repo.clone_from(repo_url, local_path, multi_options=["--filter=blob:none", "--depth=1", "--sparse"])
+                repo.git.sparse_checkout('set', *sparse_paths)
+            else:
+                Repo.clone_from(repo_url, local_path)
             logging.info("Repository cloned successfully.")
             newly_cloned = True
         except GitCommandError as e:
@@ -200,17 +255,17 @@ def clone_or_update_repo(repo_url: str, local_path: Path) -> bool:
 
 def extract_repo_owner_name(github_url: str) -> tuple[str | None, str | None]:
     """Extracts owner and repo name from a GitHub URL."""
-    try:
-        parsed_url = urlparse(github_url)
-        if (parsed_url.netloc.lower() == "github.com"):
-            path_parts = [part for part in parsed_url.path.strip('/').split('/') if part]
-            if len(path_parts) >= 2:
-                owner = path_parts[0]
-                repo_name = path_parts[1].replace(".git", "")
-                return owner, repo_name
-    except Exception as e:
-        logging.error(f"Error parsing GitHub URL '[{github_url}]': [{e}]")
-    return None, None
+    if not isinstance(github_url, str):
+        return None, None
+    return _parse_repo_owner_name(github_url)
+
+@functools.lru_cache(maxsize=None)
+def _parse_repo_owner_name(github_url: str) -> tuple[str | None, str | None]:
+    """Parses a GitHub URL once, every URL is looked up again while selecting and processing the repositories."""
+    match = GITHUB_URL_PATTERN.match(github_url)
+    if not match:
+        return None, None
+    return match[1], match[2].removesuffix(".git")
 
 def handle_github_api_error(error: RequestError, action: str):
     """Logs details of a GitHub API error, including rate limits."""
@@ -242,6 +297,69 @@ def check_dependabot_config(gh: GitHub, owner: str, repo: str) -> bool:
         logging.error(f"Unexpected error checking dependabot config for [{owner}/{repo}]: [{e}]")
         return False
 
+REPO_STATE_FRAGMENT = """
+fragment RepoState on Repository {
+  defaultBranchRef { name target { oid } }
+  dependabotConfig: object(expression: "HEAD:.github/dependabot.yml") { ... on Blob { oid } }
+}
+"""
+
+def batch_fetch_repo_state(gh: GitHub, org: str, repo_names: list[str], batch_size: int = 50) -> dict[str, dict[str, Any]]:
+    """Fetches the default branch and Dependabot state for many repositories using batched GraphQL queries.
+
+    Each batch of repositories is requested in a single GraphQL query using aliases, which replaces
+    several REST calls per repository with one request per batch.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        org: The name of the organization owning the repositories.
+        repo_names: The names of the repositories to fetch the state for.
+        batch_size: The number of repositories to request per GraphQL query.
+
+    Returns:
+        A dictionary keyed by repository name. Each value is a dictionary with the keys
+        'default_branch', 'head_sha' and 'has_dependabot_config'.
+        Repositories that could not be found or fetched are omitted, so callers can fall back to REST.
+    """
+    repo_states = {}
+    for start in range(0, len(repo_names), batch_size):
+        batch = repo_names[start:start + batch_size]
+        variables = {"owner": org}
+        declarations = ["$owner: String!"]
+        fields = []
+        for idx, name in enumerate(batch):
+            variables[f"name{idx}"] = name
+            declarations.append(f"$name{idx}: String!")
+            fields.append(f"r{idx}: repository(owner: $owner, name: $name{idx}) {{ ...RepoState }}")
+        query = f"query({', '.join(declarations)}) {{ {' '.join(fields)} }}{REPO_STATE_FRAGMENT}"
+
+        try:
+            data = gh.graphql.request(query, variables)
+        except GraphQLFailed as e:
+            # repositories that do not exist are reported as errors next to the data of the other aliases
+            logging.warning(f"GraphQL batch for [{org}] returned errors, using partial results: [{e}]")
+            data = e.response.data or {}
+        except RequestFailed as e:
+            handle_github_api_error(e, f"fetching repository state batch for org [{org}]")
+            continue
+        except Exception as e:
+            logging.error(f"Unexpected error fetching repository state batch for org [{org}]: [{e}]")
+            continue
+
+        for idx, name in enumerate(batch):
+            repo_data = data.get(f"r{idx}")
+            if not repo_data:
+                continue
+            default_branch_ref = repo_data.get("defaultBranchRef") or {}
+            repo_states[name] = {
+                "default_branch": default_branch_ref.get("name"),
+                "head_sha": (default_branch_ref.get("target") or {}).get("oid"),
+                "has_dependabot_config": repo_data.get("dependabotConfig") is not None,
+            }
+
+    logging.info(f"Fetched state for [{len(repo_states)}] of [{len(repo_names)}] repositories in [{org}] using GraphQL.")
+    return repo_states
+
 def list_all_repositories_for_org(gh: GitHub, org: str) -> list[FullRepository]:
     """Lists all repositories for a given organization, handling pagination.
 
@@ -338,13 +456,56 @@ def update_repository_properties(gh: GitHub, target_org: str, target_repo_name:
 
         raise
 
-def get_repository_properties(gh: GitHub, target_org: str, target_repo_name: str, existing_repos_properties: list[dict]) -> dict[str, Any]:
+def update_repository_properties_in_bulk(gh: GitHub, target_org: str, repo_names: list[str], properties: dict[str, Any], batch_size: int = 30) -> list[str]:
+    """Sets the same *custom* property values on many repositories with the organization endpoint.
+
+    Every call updates up to batch_size repositories (30 is the API maximum), instead of
+    one call per repository.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The name of the organization owning the repositories.
+        repo_names: The names of the repositories to update.
+        properties: A dictionary where keys are the names of the *custom* properties
+                    to update and values are the new values to set.
+        batch_size: The number of repositories to update per API call.
+
+    Returns:
+        list[str]: The names of the repositories that were updated successfully.
+    """
+    custom_properties_list = [
+        {"property_name": property_name, "value": str(value).lower() if isinstance(value, bool) else str(value)}
+        for property_name, value in properties.items()
+    ]
+    property_names = list(properties.keys())  # For logging
+
+    updated_repo_names = []
+    for start in range(0, len(repo_names), batch_size):
+        batch = repo_names[start:start + batch_size]
+        try:
+            logging.info(f"Attempting to update custom properties {property_names} for [{len(batch)}] repositories in [{target_org}]...")
+            gh.rest.orgs.custom_properties_for_repos_create_or_update_organization_values(
+                org=target_org,
+                repository_names=batch,
+                properties=custom_properties_list
+            )
+            updated_repo_names.extend(batch)
+        except RequestFailed as e:
+            handle_github_api_error(e, f"updating custom repository properties {property_names} for {batch} in [{target_org}]")
+        except Exception as e:
+            logging.error(f"An unexpected error occurred while updating custom repository properties {property_names} for {batch} in [{target_org}]: [{e}]")
+
+    logging.info(f"Successfully updated custom properties {property_names} for [{len(updated_repo_names)}/{len(repo_names)}] repositories in [{target_org}].")
+    return updated_repo_names
+
+def get_repository_properties(gh: GitHub, target_org: str, target_repo_name: str, existing_repos_properties_by_name: dict[str, Any]) -> dict[str, Any]:
     """Retrieves *custom* repository properties using the GitHub REST API.
 
     Args:
         gh: Authenticated GitHub client instance.
         target_org: The name of the organization owning the repository.
         target_repo_name: The name of the repository to retrieve properties for.
+        existing_repos_properties_by_name: The organization's custom property values, keyed by repository name.
 
     Returns:
         A dictionary where keys are the names of the *custom* properties
@@ -358,14 +519,14 @@ def get_repository_properties(gh: GitHub, target_org: str, target_repo_name: str
     try:
         logging.info(f"Fetching custom properties for [{target_org}/{target_repo_name}]...")
 
-        # first search in the existing properties list
-        for repo_properties in existing_repos_properties:
-            if repo_properties.repository_name == target_repo_name:
-                # use the existing properties if found
-                properties = repo_properties.properties
-                logging.info(f"Found existing custom properties for [{target_org}/{target_repo_name}].")
-                # Fix: Access attributes properly for CustomPropertyValue objects
-                return {prop.property_name: prop.value for prop in properties}
+        # first look up the existing properties
+        repo_properties = existing_repos_properties_by_name.get(target_repo_name)
+        if repo_properties:
+            # use the existing properties if found
+            properties = repo_properties.properties
+            logging.info(f"Found existing custom properties for [{target_org}/{target_repo_name}].")
+            # Fix: Access attributes properly for CustomPropertyValue objects
+            return {prop.property_name: prop.value for prop in properties}
 
         properties = gh.rest.repos.get_custom_properties_values(
             owner=target_org,
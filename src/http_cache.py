@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+import hishel
+import httpcore
+from githubkit.cache import MemCacheStrategy
+
+
+def _without_authorization(request: httpcore.Request) -> httpcore.Request:
+    """Returns a copy of the request without the Authorization header."""
+    headers = [(name, value) for name, value in request.headers if name.lower() != b"authorization"]
+    return httpcore.Request(request.method, request.url, headers=headers, extensions=request.extensions)
+
+
+class RedactingJSONSerializer(hishel.JSONSerializer):
+    """
+    hishel serializer that drops the Authorization header from the stored request.
+
+    hishel stores the request headers with every cached response, the installation token must not end up on disk.
+    """
+
+    def dumps(self, response: httpcore.Response, request: httpcore.Request, metadata: hishel.Metadata) -> Union[str, bytes]:
+        return super().dumps(response=response, request=_without_authorization(request), metadata=metadata)
+
+
+class InstallationCacheController(hishel.Controller):
+    """
+    Cache controller that ignores the Authorization header when matching "Vary" headers.
+
+    GitHub answers with "Vary: Authorization", and the installation token changes on every run.
+    All requests are made by the same GitHub App installation, so the cached responses can be
+    revalidated with a newer token instead of being thrown away.
+    """
+
+    def _validate_vary(self, request: httpcore.Request, response: httpcore.Response, original_request: httpcore.Request) -> bool:
+        return super()._validate_vary(
+            request=_without_authorization(request),
+            response=response,
+            original_request=_without_authorization(original_request)
+        )
+
+
+class SQLiteCacheStrategy(MemCacheStrategy):
+    """
+    githubkit cache strategy that persists the HTTP cache in a SQLite file.
+
+    githubkit always revalidates cached responses with their ETag, so unchanged resources are
+    answered with 304 Not Modified, which does not count against the primary rate limit.
+    Keeping the cache on disk makes this work across runs instead of only within a single run.
+    Installation tokens are cached in memory only, the Authorization header is removed from the
+    cached requests before they are written to the SQLite file.
+    """
+
+    def __init__(self, cache_path: Path, ttl_seconds: Optional[float] = None) -> None:
+        super().__init__()
+        self.cache_path = Path(cache_path)
+        self.ttl_seconds = ttl_seconds
+
+    def get_hishel_controller(self) -> hishel.Controller:
+        return InstallationCacheController(**self.get_hishel_controller_options())
+
+    def get_hishel_storage(self) -> hishel.SQLiteStorage:
+        # githubkit creates an HTTP client per request outside of `with gh:` and closing the client closes
+        # the storage, so every client gets its own connection to the cache file
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.cache_path, check_same_thread=False)
+        return hishel.SQLiteStorage(serializer=RedactingJSONSerializer(), connection=connection, ttl=self.ttl_seconds)
@@ -1,10 +1,18 @@
 import datetime
 import os
-import json
+import re
 import argparse
 import logging
+import sqlite3
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from pathlib import Path
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from githubkit.exception import RequestFailed
 from githubkit.versions.latest.models import FullRepository
 from dotenv import load_dotenv
@@ -12,31 +20,61 @@ from typing import Any, List  # Or replace with specific githubkit client type
 import time
 
 # Import the local functions
-from .github import get_github_client, enable_ghas_features, check_dependabot_config, clone_or_update_repo, extract_repo_owner_name, get_repository_properties, handle_github_api_error, list_all_repositories_for_org, list_all_repository_properties_for_org, show_rate_limit, update_repository_properties
+from .github import get_github_client, enable_ghas_features, batch_fetch_repo_state, check_dependabot_config, clone_or_update_repo, extract_repo_owner_name, handle_github_api_error, list_all_repositories_for_org, list_all_repository_properties_for_org, show_rate_limit, update_repository_properties, update_repository_properties_in_bulk
 from .constants import Constants
+from .functions import configure_queued_logging
 
 # Configuration
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_queued_logging(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logging.getLogger("githubkit").setLevel(logging.WARNING)  # Reduce verbosity from githubkit
 load_dotenv()  # Load environment variables from .env file
 
 # Collection of MCP server list loader functions
 MCP_SERVER_LOADERS = []
 
+# Shared HTTP session for the loaders, keeps connections alive and retries transient failures
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+HTTP_TIMEOUT_SECONDS = 10
 
-def load_mcp_servers_from_mcp_agents_hub() -> list[Path]:
+# Number of repositories to fetch the state for in a single GraphQL query
+REPO_STATE_BATCH_SIZE = 50
+
+# Number of threads reading MCP Agents Hub JSON files, the files are small so this is mostly waiting on the disk
+JSON_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Maximum number of seconds to wait for newly created forks to be ready
+FORK_READY_TIMEOUT_SECONDS = 60
+
+# Number of repositories processed concurrently, the calls are I/O bound
+PROCESSING_WORKERS = 8
+
+# Number of concurrent write calls (fork, sync, enable GHAS), kept low to stay under GitHub's secondary rate limits
+PROCESSING_WRITE_WORKERS = 2
+WRITE_SLOTS = threading.BoundedSemaphore(PROCESSING_WRITE_WORKERS)
+
+
+def load_mcp_servers_from_mcp_agents_hub() -> list[str]:
     """
     Loads MCP server configurations from the MCP Agents Hub repository.
 
-    This function clones or updates the MCP Agents Hub repository and finds
+    This function clones or updates the MCP Agents Hub repository and reads
     all JSON files in the specified directory within the repository.
 
     Returns:
-        A list of Path objects pointing to the JSON files containing server configurations.
+        A list of GitHub URLs read from the server configuration JSON files.
         Returns an empty list if no files are found or if there's an error.
     """
     # Clone or Update MCP Agents Hub repo
-    newly_cloned = clone_or_update_repo(Constants.AgentsHub.MCP_AGENTS_HUB_REPO_URL, Constants.AgentsHub.LOCAL_REPO_PATH)
+    newly_cloned = clone_or_update_repo(
+        Constants.AgentsHub.MCP_AGENTS_HUB_REPO_URL,
+        Constants.AgentsHub.LOCAL_REPO_PATH,
+        sparse_paths=[Constants.AgentsHub.SERVER_FILES_DIR_PATH.as_posix()]
+    )
     if newly_cloned:
         logging.info(f"MCP Agents Hub repository newly cloned to [{Constants.AgentsHub.LOCAL_REPO_PATH}]")
     else:
@@ -48,29 +86,63 @@ def load_mcp_servers_from_mcp_agents_hub() -> list[Path]:
         logging.error(f"JSON directory not found: [{json_dir}]")
         return []
 
-    server_repo = sorted(list(json_dir.glob("*.json")))  # Sort for consistent runs
+    # os.scandir reads the names without creating a Path per file, sort for consistent runs
+    with os.scandir(json_dir) as entries:
+        server_repo = sorted((entry.name, entry.path) for entry in entries if entry.name.endswith(".json") and entry.is_file())
     if not server_repo:
         logging.warning(f"No JSON files found in [{json_dir}]")
         return []
 
     logging.info(f"Found [{len(server_repo)}] JSON files in MCP Agents Hub repository")
 
+    # Read the JSON files concurrently so the disk reads overlap, the network stage only needs the resulting URLs
+    with ThreadPoolExecutor(max_workers=JSON_READ_WORKERS) as pool:
+        json_file_paths = [json_file_path for _, json_file_path in server_repo]
+        parsed_files = list(pool.map(read_github_url_from_json, json_file_paths))
+
     all_server_repos = []
-    for json_file_path in server_repo:
-        with open(json_file_path, 'r') as f:
-            data = json.load(f)
-            github_url = data.get("githubUrl")
-            if github_url:
-                all_server_repos.append(github_url)
-            else:
-                logging.warning(f"Skipping [{json_file_path.name}]: 'githubUrl' not found.")
+    for (json_file_name, _), (github_url, error) in zip(server_repo, parsed_files):
+        if github_url:
+            all_server_repos.append(github_url)
+        elif error:
+            logging.warning(f"Skipping [{json_file_name}]: [{error}]")
+        else:
+            logging.warning(f"Skipping [{json_file_name}]: 'githubUrl' not found.")
 
     return all_server_repos
 
+
+def read_github_url_from_json(json_file_path: str) -> tuple[str | None, str | None]:
+    """
+    Reads the GitHub URL from an MCP Agents Hub server JSON file.
+
+    Runs in a worker thread, so it only does file work and leaves the logging to the caller.
+
+    Args:
+        json_file_path: Path to the server JSON file.
+
+    Returns:
+        A tuple (github_url, error):
+        - github_url: The 'githubUrl' value from the file, None if missing or unreadable.
+        - error: A description of why the file could not be parsed, None otherwise.
+    """
+    try:
+        data = orjson.loads(Path(json_file_path).read_bytes())
+        return data.get("githubUrl"), None
+    except orjson.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e}"
+    except (OSError, AttributeError) as e:
+        return None, f"Could not read server configuration: {e}"
+
 # Register the MCP Agents Hub loader
 MCP_SERVER_LOADERS.append(load_mcp_servers_from_mcp_agents_hub)
 
 
+# Markdown links to a repository (owner/repo, optionally followed by a deeper path, an anchor or a query string)
+# in the awesome-mcp-servers README
+AWESOME_README_REPO_LINK_PATTERN = re.compile(r"\]\((https://github\.com/[^/\s)#?]+/[^/\s)#?]+)[/)#?]")
+
+
 def load_mcp_servers_from_awesome_mcp_servers() -> List[str]:
     """
     Loads MCP server configurations from the awesome-mcp-servers repository.
@@ -88,27 +160,16 @@ def load_mcp_servers_from_awesome_mcp_servers() -> List[str]:
         logging.info(f"Fetching awesome-mcp-servers list from [{raw_readme_url}]")
 
         # Fetch the raw README content
-        response = requests.get(raw_readme_url)
+        response = HTTP_SESSION.get(raw_readme_url, timeout=HTTP_TIMEOUT_SECONDS)
         response.raise_for_status()  # Raise an exception for 4XX/5XX responses
 
         # Parse the content for URLs
         content = response.text
 
-        # Get all GitHub repository URLs
-        github_urls = []
-        lines = content.split('\n')
-
-        for line in lines:
-            # Look for markdown links: [text](url)
-            if '](https://github.com/' in line and '](#' not in line:  # Exclude internal links
-                start_idx = line.find('](https://github.com/') + 2  # Position after ](
-                end_idx = line.find(')', start_idx)
-                if end_idx > start_idx:
-                    url = line[start_idx:end_idx]
-                    # Ensure it's a repo URL (contains exactly one / after github.com/)
-                    parts = url.replace('https://github.com/', '').split('/')
-                    if len(parts) >= 2 and parts[0] and parts[1]:  # Valid owner/repo format
-                        github_urls.append(url)
+        # Get all GitHub repository URLs in a single pass, deduplicated in order of appearance
+        github_urls = list(dict.fromkeys(
+            match.group(1) for match in AWESOME_README_REPO_LINK_PATTERN.finditer(content)
+        ))
 
         if not github_urls:
             logging.warning(f"No GitHub repository URLs found in awesome-mcp-servers README")
@@ -130,25 +191,27 @@ MCP_SERVER_LOADERS.append(load_mcp_servers_from_awesome_mcp_servers)
 
 
 def ensure_repository_fork(
-    existing_repos: list[FullRepository],
+    existing_repos_by_name: dict[str, FullRepository],
     gh: Any,
     source_owner: str,
     source_repo: str,
     target_org: str,
     target_repo_name: str,
-    source_repo_full_name: str
+    source_repo_full_name: str,
+    known_missing_repos: dict[str, str] | None = None
 ) -> tuple[bool, bool, str]:
     """
     Checks if a fork exists in the target organization, creates it if not.
 
     Args:
-        existing_repos: List of existing repositories in the target organization.
+        existing_repos_by_name: Existing repositories in the target organization, keyed by lowercase full name.
         gh: Authenticated GitHub client instance.
         source_owner: Owner of the source repository.
         source_repo: Name of the source repository.
         target_org: The target GitHub organization to fork into.
         target_repo_name: The desired name for the fork in the target organization.
         source_repo_full_name: The full name of the source repository (owner/repo).
+        known_missing_repos: Optional dict of source repositories that could not be found, a 404 on forking is recorded here.
 
     Returns:
         A tuple (fork_exists, fork_skipped, failure_reason):
@@ -161,13 +224,11 @@ def ensure_repository_fork(
     failure_reason = ""  # Initialize failure reason string
     try:
         logging.info(f"Checking if fork exists for [{target_repo_name}] in [{target_org}]...")
-        # check if the fork already exists in the exising_repos list
-        search_name = f"{target_org}/{target_repo_name}".lower()
-        target_repo_info = next((r for r in existing_repos if r.full_name.lower() == search_name), None)
-        parent_full_name = get_parent_full_name(target_repo_info)
+        # check if the fork already exists in the target org
+        target_repo_info = existing_repos_by_name.get(f"{target_org}/{target_repo_name}".lower())
 
         # check if it's actually a fork of the correct source
-        if target_repo_info and target_repo_info.fork and parent_full_name.lower() == source_repo_full_name.lower():
+        if target_repo_info and target_repo_info.fork and get_parent_full_name(target_repo_info).lower() == source_repo_full_name.lower():
             logging.info(f"Fork [{target_org}/{target_repo_name}] already exists.")
             fork_exists = True
         elif target_repo_info:  # repository exists but is not the correct fork
@@ -177,13 +238,14 @@ def ensure_repository_fork(
             logging.info(f"Fork [{target_org}/{target_repo_name}] does not exist. Creating fork...")
             try:
                 # fork the repository
-                gh.rest.repos.create_fork(
-                    owner=source_owner,
-                    repo=source_repo,
-                    org=target_org,  # specify the target organization
-                    name=target_repo_name,  # specify the new name for the fork
-                    default_branch_only=True  # fork only the default branch
-                )
+                with WRITE_SLOTS:
+                    gh.rest.repos.create_fork(
+                        owner=source_owner,
+                        repo=source_repo,
+                        org=target_org,  # specify the target organization
+                        name=target_repo_name,  # specify the new name for the fork
+                        default_branch_only=True  # fork only the default branch
+                    )
                 logging.info(f"Fork creation initiated for [{source_repo_full_name}] into [{target_org}/{target_repo_name}]. API response status might be 202 Accepted.")
                 # assume fork will be available shortly for subsequent steps
                 fork_exists = True
@@ -192,6 +254,8 @@ def ensure_repository_fork(
                 if fork_error.response.status_code == 404:
                     failure_reason = "Source repository not found or not accessible"
                     logging.error(f"Could not find source repository [{source_repo_full_name}] to fork.")
+                    if known_missing_repos is not None:
+                        known_missing_repos[source_repo_full_name.lower()] = datetime.date.today().isoformat()
                 else:
                     failure_reason = f"GitHub API error: {fork_error}"
                     handle_github_api_error(fork_error, f"forking [{source_repo_full_name}] to [{target_org}]")
@@ -251,12 +315,13 @@ def get_parent_full_name(repo_info: FullRepository) -> str:
     return ""
 
 
-def reprocess_repository(properties: dict) -> bool:
+def reprocess_repository(properties: dict, verbose: bool = True) -> bool:
     """
     Checks if a repository should be reprocessed based on its properties.
 
     Args:
         properties: Dictionary of repository properties.
+        verbose: Whether to log why the repository is skipped.
 
     Returns:
         True if the repository should be reprocessed, False otherwise.
@@ -269,26 +334,29 @@ def reprocess_repository(properties: dict) -> bool:
 
         last_updated_time = datetime.datetime.fromisoformat(last_updated)
         if datetime.datetime.now() - last_updated_time < datetime.timedelta(days=7):
-            logging.info("Repository was last updated within the last 7 days. Skipping reprocessing.")
+            if verbose:
+                logging.info("Repository was last updated within the last 7 days. Skipping reprocessing.")
             return False
 
     # Check if GHAS is already enabled
     ghas_enabled = properties.get("GHAS_Enabled")
     if ghas_enabled:
-        logging.info("GHAS features are already enabled. Skipping reprocessing.")
+        if verbose:
+            logging.info("GHAS features are already enabled. Skipping reprocessing.")
         return False
 
     # Check if Dependabot config is already present
     dependabot_configured = properties.get("HasDependabotConfig")
     if dependabot_configured:
-        logging.info("Dependabot configuration is already present. Skipping reprocessing.")
+        if verbose:
+            logging.info("Dependabot configuration is already present. Skipping reprocessing.")
         return False
 
     # Reprocess if none of the above conditions are met
     return True
 
 
-def update_forked_repo(gh: Any, target_org: str, target_repo_name: str):
+def update_forked_repo(gh: Any, target_org: str, target_repo_name: str, default_branch: str | None = None, previous_head_sha: str | None = None) -> str | None:
     """
     Updates the forked repository with changes from the upstream source.
 
@@ -296,56 +364,111 @@ def update_forked_repo(gh: Any, target_org: str, target_repo_name: str):
         gh: Authenticated GitHub client instance.
         target_org: The target GitHub organization where the fork is located.
         target_repo_name: The name of the forked repository in the target organization.
+        default_branch: The default branch of the fork, if already known. Looked up via the API otherwise.
+        previous_head_sha: The head commit of the default branch before the update, if already known.
+                           Used to detect when the updated branch is visible.
+
+    Returns:
+        The merge type reported by GitHub ("none" when the fork was already up to date), None if the update failed.
     """
     try:
-        # first we need to locate the default branch of the fork
-        fork_info = gh.rest.repos.get(
-            owner=target_org,
-            repo=target_repo_name
-        )
+        fork_default_branch = default_branch
+        if not fork_default_branch:
+            # first we need to locate the default branch of the fork
+            fork_info = gh.rest.repos.get(
+                owner=target_org,
+                repo=target_repo_name
+            ).parsed_data
 
-        fork_default_branch = None
-        if not fork_info.default_branch:
-            logging.warning(f"Could not find default branch for [{target_org}/{target_repo_name}]. Skipping update.")
-            return
-        else:
+            if not fork_info.default_branch:
+                logging.warning(f"Could not find default branch for [{target_org}/{target_repo_name}]. Skipping update.")
+                return None
             fork_default_branch = fork_info.default_branch
 
-        if fork_default_branch:
-            logging.info(f"Updating forked repository: [{target_org}/{target_repo_name}]")
-            gh.rest.repos.update_branch(
+        logging.info(f"Updating forked repository: [{target_org}/{target_repo_name}]")
+        with WRITE_SLOTS:
+            merge_type = gh.rest.repos.merge_upstream(
                 owner=target_org,
                 repo=target_repo_name,
-                branch=fork_default_branch,  # update the default branch
-                expected_head=fork_default_branch  # ensure the branch is at the default head
-            )
-            logging.info(f"Successfully updated forked repository: [{target_org}/{target_repo_name}]")
+                branch=fork_default_branch  # update the default branch
+            ).parsed_data.merge_type
+        logging.info(f"Successfully updated forked repository: [{target_org}/{target_repo_name}] (merge type: [{merge_type}])")
+
+        if merge_type != "none":
+            wait_for_fork_ready(gh, target_org, target_repo_name, fork_default_branch, previous_head_sha)
+        return merge_type
     except RequestFailed as e:
         handle_github_api_error(e, f"updating forked repository [{target_org}/{target_repo_name}]")
     except Exception as e:
         logging.error(f"An unexpected error occurred updating forked repository [{target_org}/{target_repo_name}]: [{e}]")
+    return None
+
+
+def wait_for_fork_ready(gh: Any, target_org: str, target_repo_name: str, branch: str, previous_head_sha: str | None = None, timeout: float = 5.0) -> bool:
+    """
+    Polls the branch of a fork until the update from upstream is visible, with exponential backoff.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The target GitHub organization where the fork is located.
+        target_repo_name: The name of the forked repository in the target organization.
+        branch: The branch that was updated.
+        previous_head_sha: The head commit before the update, the branch is ready once its head differs.
+                           The branch is ready as soon as it has a head commit when not set.
+        timeout: Maximum number of seconds to wait.
+
+    Returns:
+        True if the fork is ready, False if the timeout was reached.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.2
+    while True:
+        head_sha = gh.rest.repos.get_branch(owner=target_org, repo=target_repo_name, branch=branch).parsed_data.commit.sha
+        if head_sha and head_sha != previous_head_sha:
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logging.warning(f"Fork [{target_org}/{target_repo_name}] did not show the upstream changes after [{timeout}] seconds.")
+            return False
+        time.sleep(min(delay, remaining))
+        delay *= 2
 
 
 def process_repository(
-    existing_repos: list[FullRepository],
+    existing_repos_by_name: dict[str, FullRepository],
     github_url: str,
     gh: Any,  # Replace Any with the actual type of the GitHub client
     target_org: str,
-    existing_repos_properties: list[dict],
     processed_repos: set[str],
-    failed_forks: dict[str, str]   # Changed to dict to store repo name -> failure reason
+    failed_forks: dict[str, str],   # Changed to dict to store repo name -> failure reason
+    repo_states: dict[str, dict[str, Any]] | None = None,
+    pending_property_updates: list[tuple[str, dict[str, Any]]] | None = None,
+    known_missing_repos: dict[str, str] | None = None,
+    run_timestamp: str | None = None,
+    pending_new_forks: list[tuple[str, str]] | None = None
 ) -> tuple[int, int, bool, bool]:
     """
     Processes a single repository based on data from a JSON file.
 
+    The caller is expected to have dropped the forks that do not need processing with select_repos_to_process,
+    which checks the custom properties of all repositories at once.
+
     Args:
-        existing_repos: List of existing repositories in the target organization.
+        existing_repos_by_name: Existing repositories in the target organization, keyed by lowercase full name.
         githubUrl: url to the GitHub url to analyze.
         gh: Authenticated GitHub client instance.
         target_org: The target GitHub organization to fork into.
-        existing_repos_properties: List of repository properties.
         processed_repos: A set of already processed source repository full names (e.g., "owner/repo").
         failed_forks: A dict mapping repository names to their failure reasons.
+        repo_states: Optional dict of prefetched fork state (see batch_fetch_repo_state), keyed by target repo name.
+        pending_property_updates: Optional list to queue the property updates on, they are written in bulk
+                                  by flush_property_updates. The properties are updated right away when not set.
+        known_missing_repos: Optional dict of source repositories that could not be found, see load_known_missing_repos.
+        run_timestamp: Optional ISO timestamp of the run to store as LastUpdated, the current time is used when not set.
+        pending_new_forks: Optional list to queue newly created forks on as (source repo full name, target repo name),
+                           they are finished by finish_new_forks once GitHub has created them.
+                           New forks are processed right away when not set.
 
     Returns:
         A tuple (processed_increment, dependabot_increment, skipped_non_fork, failed_fork)
@@ -367,17 +490,15 @@ def process_repository(
             return 0, 0, False, False  # No processing
 
         source_repo_full_name = f"{source_owner}/{source_repo}"
-        if source_repo_full_name in processed_repos:
-            logging.info(f"Skipping duplicate source repository: [{source_repo_full_name}]")
-            # Return 0,0 but indicate it was processed previously (not skipped/failed *this time*)
-            return 0, 0, False, False
 
         # Keep the same repo name in the target org, but prefix it with the original owner and a double underscore
         target_repo_name = get_target_repo_name(source_owner, source_repo)
 
         # Check if fork exists or create it
+        is_new_fork = f"{target_org}/{target_repo_name}".lower() not in existing_repos_by_name
         fork_exists, fork_skipped_flag, failure_reason = ensure_repository_fork(
-            existing_repos, gh, source_owner, source_repo, target_org, target_repo_name, source_repo_full_name
+            existing_repos_by_name, gh, source_owner, source_repo, target_org, target_repo_name, source_repo_full_name,
+            known_missing_repos
         )
 
         # If fork creation failed or check failed, ensure_repository_fork returns fork_exists=False
@@ -404,50 +525,25 @@ def process_repository(
         # This ensures even if we skip due to recent update/GHAS already enabled, we count it as "encountered"
         processed_repos.add(source_repo_full_name)
 
-        # load the repository properties to check if we need to do something
-        properties = get_repository_properties(gh, target_org, target_repo_name, existing_repos_properties)
-        if properties:
-            # check if we still need to process this repository or not
-            if not reprocess_repository(properties):
-                logging.info(f"Skipping reprocessing for [{target_org}/{target_repo_name}] based on properties.")
-                # It was processed successfully before, return 0 for *new* processing this run
-                # Return False for skipped/failed as it was handled correctly
-                return 0, 0, False, False
-        else:
-            # properties not found, so have not been set yet
-            logging.info(f"No properties found for [{target_org}/{target_repo_name}]. Processing...")
+        # Fork creation is asynchronous, finish new forks in one go once they are ready
+        if is_new_fork and pending_new_forks is not None:
+            logging.info(f"Queued new fork [{target_org}/{target_repo_name}] until it is ready.")
+            pending_new_forks.append((source_repo_full_name, target_repo_name))
+            return 1, 0, False, False
 
-        # If fork exists and needs processing (or properties check passed)
+        # The properties were already checked for all repositories at once by select_repos_to_process
         logging.info(f"Processing source repository: [{source_repo_full_name}] (Target: [{target_org}/{target_repo_name}])")
 
-        # Update the fork with upstream changes
-        update_forked_repo(gh, target_org, target_repo_name)
+        # Use the prefetched state if available, newly created forks fall back to REST calls
+        repo_state = (repo_states or {}).get(target_repo_name)
 
-        # Wait 3 seconds to allow the fork to update with latest alerts
-        logging.info("Waiting for fork to update with latest changes...")
-        time.sleep(3)
-
-        enable_ghas_features(gh, target_org, target_repo_name)
-        dependabot_configured = check_dependabot_config(gh, target_org, target_repo_name)
-        if dependabot_configured:
+        if enable_fork_features(gh, target_org, target_repo_name, repo_state, run_timestamp, pending_property_updates):
             dependabot_increment = 1
-
-        properties_to_update = {
-            "GHAS_Enabled": True,
-            "LastUpdated": datetime.datetime.now().isoformat(),
-            "HasDependabotConfig": dependabot_configured
-        }
-        update_repository_properties(gh, target_org, target_repo_name, properties_to_update)
         processed_increment = 1  # Mark as successfully processed *this run*
 
-    except json.JSONDecodeError:
-        error_reason = f"Invalid JSON in file {json_file_path.name}"
-        logging.error(f"Skipping [{json_file_path.name}]: Invalid JSON.")
-        failed_forks[source_repo_full_name] = error_reason if source_repo_full_name else error_reason
-        failed_fork = True
     except Exception as e:
         error_reason = f"Unexpected error: {str(e)}"
-        logging.error(f"An unexpected error occurred processing [{json_file_path.name}]: [{e}]")
+        logging.error(f"An unexpected error occurred processing [{github_url}]: [{e}]")
         if source_repo_full_name:
             failed_forks[source_repo_full_name] = error_reason
         processed_increment = 0
@@ -458,9 +554,390 @@ def process_repository(
     return processed_increment, dependabot_increment, skipped_non_fork, failed_fork
 
 
+def enable_fork_features(
+    gh: Any,
+    target_org: str,
+    target_repo_name: str,
+    repo_state: dict[str, Any] | None = None,
+    run_timestamp: str | None = None,
+    pending_property_updates: list[tuple[str, dict[str, Any]]] | None = None,
+    sync_with_upstream: bool = True
+) -> bool:
+    """
+    Syncs a fork with its upstream, enables GHAS and records the result in the custom properties.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The target GitHub organization where the fork is located.
+        target_repo_name: The name of the fork in the target organization.
+        repo_state: Optional prefetched fork state (see batch_fetch_repo_state), REST calls are used when not set.
+        run_timestamp: Optional ISO timestamp of the run to store as LastUpdated, the current time is used when not set.
+        pending_property_updates: Optional list to queue the property updates on, see flush_property_updates.
+        sync_with_upstream: Whether to update the fork with upstream changes first, not needed for new forks.
+
+    Returns:
+        True if the fork has a Dependabot config, False otherwise.
+    """
+    # The prefetched state is only current if the fork did not change since it was fetched
+    repo_state_current = repo_state is not None
+    if sync_with_upstream:
+        # Update the fork with upstream changes, this waits until the changes are visible
+        merge_type = update_forked_repo(
+            gh, target_org, target_repo_name,
+            repo_state["default_branch"] if repo_state else None,
+            repo_state["head_sha"] if repo_state else None
+        )
+        # The merge can add or remove the Dependabot config, check it again unless nothing was merged
+        repo_state_current = repo_state_current and merge_type == "none"
+
+    with WRITE_SLOTS:
+        enable_ghas_features(gh, target_org, target_repo_name)
+    if repo_state_current:
+        dependabot_configured = repo_state["has_dependabot_config"]
+        logging.info(f"Dependabot config {'found' if dependabot_configured else 'not found'} in [{target_org}/{target_repo_name}] (prefetched).")
+    else:
+        dependabot_configured = check_dependabot_config(gh, target_org, target_repo_name)
+
+    properties_to_update = {
+        "GHAS_Enabled": True,
+        "LastUpdated": run_timestamp or datetime.datetime.now().isoformat(timespec="seconds"),
+        "HasDependabotConfig": dependabot_configured
+    }
+    if pending_property_updates is not None:
+        pending_property_updates.append((target_repo_name, properties_to_update))
+    else:
+        update_repository_properties(gh, target_org, target_repo_name, properties_to_update)
+    return dependabot_configured
+
+
+def wait_for_new_forks(gh: Any, target_org: str, target_repo_names: list[str], timeout_seconds: float = FORK_READY_TIMEOUT_SECONDS) -> dict[str, dict[str, Any]]:
+    """
+    Polls until newly created forks are ready, checking all of them in one GraphQL query per round.
+
+    A fork is ready once its default branch is available. The polling interval doubles after every
+    round, until all forks are ready or the timeout is reached.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The target GitHub organization where the forks are created.
+        target_repo_names: The names of the new forks.
+        timeout_seconds: Maximum time to wait for the forks.
+
+    Returns:
+        A dict mapping the names of the ready forks to their state (see batch_fetch_repo_state).
+    """
+    ready_states = {}
+    waiting_names = list(target_repo_names)
+    deadline = time.monotonic() + timeout_seconds
+    delay = 2
+    while waiting_names:
+        repo_states = batch_fetch_repo_state(gh, target_org, waiting_names, REPO_STATE_BATCH_SIZE)
+        ready_states.update({name: state for name, state in repo_states.items() if state["default_branch"]})
+        waiting_names = [name for name in waiting_names if name not in ready_states]
+
+        remaining = deadline - time.monotonic()
+        if not waiting_names or remaining <= 0:
+            break
+        logging.info(f"Waiting [{min(delay, remaining):.0f}] seconds for [{len(waiting_names)}] new forks to be ready...")
+        time.sleep(min(delay, remaining))
+        delay *= 2
+
+    if waiting_names:
+        logging.warning(f"[{len(waiting_names)}] new forks were not ready after [{timeout_seconds}] seconds: {waiting_names}")
+    return ready_states
+
+
+def finish_new_forks(
+    gh: Any,
+    target_org: str,
+    pending_new_forks: list[tuple[str, str]],
+    failed_forks: dict[str, str],
+    run_timestamp: str | None = None,
+    pending_property_updates: list[tuple[str, dict[str, Any]]] | None = None
+) -> tuple[int, int]:
+    """
+    Waits for the forks created in this run and enables GHAS on the ones that are ready.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The target GitHub organization where the forks are created.
+        pending_new_forks: List of (source repo full name, target repo name) tuples queued by process_repository.
+        failed_forks: A dict mapping repository names to their failure reasons, forks that could not be finished are added.
+        run_timestamp: Optional ISO timestamp of the run to store as LastUpdated.
+        pending_property_updates: Optional list to queue the property updates on, see flush_property_updates.
+
+    Returns:
+        A tuple (dependabot_count, failed_count)
+    """
+    target_repo_names = [target_repo_name for _, target_repo_name in pending_new_forks]
+    ready_states = wait_for_new_forks(gh, target_org, target_repo_names, FORK_READY_TIMEOUT_SECONDS)
+
+    dependabot_count = 0
+    failed_count = 0
+    for source_repo_full_name, target_repo_name in pending_new_forks:
+        repo_state = ready_states.get(target_repo_name)
+        if not repo_state:
+            failed_forks[source_repo_full_name] = f"Fork was not ready after {FORK_READY_TIMEOUT_SECONDS} seconds"
+            failed_count += 1
+            continue
+
+        try:
+            logging.info(f"Processing new fork: [{target_org}/{target_repo_name}]")
+            if enable_fork_features(gh, target_org, target_repo_name, repo_state, run_timestamp, pending_property_updates, sync_with_upstream=False):
+                dependabot_count += 1
+        except Exception as e:
+            logging.error(f"An unexpected error occurred processing new fork [{target_org}/{target_repo_name}]: [{e}]")
+            failed_forks[source_repo_full_name] = f"Unexpected error: {e}"
+            failed_count += 1
+
+    return dependabot_count, failed_count
+
+
+def flush_property_updates(gh: Any, target_org: str, pending_property_updates: list[tuple[str, dict[str, Any]]]) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Writes the queued custom property updates, one bulk API call per group of identical values.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The target GitHub organization.
+        pending_property_updates: List of (target repo name, properties) tuples queued by process_repository.
+
+    Returns:
+        The (target repo name, properties) tuples that were written successfully.
+    """
+    repos_by_properties = {}
+    for target_repo_name, properties in pending_property_updates:
+        repos_by_properties.setdefault(tuple(properties.items()), []).append(target_repo_name)
+
+    written_updates = []
+    for properties, repo_names in repos_by_properties.items():
+        updated_repo_names = update_repository_properties_in_bulk(gh, target_org, repo_names, dict(properties))
+        written_updates.extend((repo_name, dict(properties)) for repo_name in updated_repo_names)
+    pending_property_updates.clear()
+    return written_updates
+
+
+def load_recently_processed_repos(state_path: Path, max_age_days: int) -> set[str]:
+    """
+    Loads the forks that were processed by previous runs on this machine within max_age_days.
+
+    Args:
+        state_path: Path to the SQLite file with the processing state.
+        max_age_days: Number of days after which a fork is processed again.
+
+    Returns:
+        A set of lowercase target repository names.
+    """
+    if not state_path.exists():
+        return set()
+
+    cutoff = (datetime.datetime.now() - datetime.timedelta(days=max_age_days)).isoformat(timespec="seconds")
+    try:
+        with closing(sqlite3.connect(state_path)) as connection:
+            rows = connection.execute("SELECT repo_name FROM processed WHERE last_run > ?", (cutoff,)).fetchall()
+    except sqlite3.Error as e:
+        logging.warning(f"Could not read the processing state from [{state_path}]: [{e}]")
+        return set()
+
+    return {repo_name for (repo_name,) in rows}
+
+
+def save_processed_repos(state_path: Path, written_updates: list[tuple[str, dict[str, Any]]]) -> None:
+    """
+    Records the forks whose properties were written in this run, so the next runs can skip them locally.
+
+    Args:
+        state_path: Path to the SQLite file with the processing state.
+        written_updates: The (target repo name, properties) tuples returned by flush_property_updates.
+    """
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(state_path)) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS processed (repo_name TEXT PRIMARY KEY, last_run TEXT, dependabot INTEGER, ghas INTEGER)"
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?)",
+                [
+                    (repo_name.lower(), properties["LastUpdated"], int(properties["HasDependabotConfig"]), int(properties["GHAS_Enabled"]))
+                    for repo_name, properties in written_updates
+                ]
+            )
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Could not save the processing state to [{state_path}]: [{e}]")
+
+
+def write_property_updates(gh: Any, target_org: str, pending_property_updates: list[tuple[str, dict[str, Any]]]) -> None:
+    """
+    Writes the queued custom property updates and records the written forks in the local processing state.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        target_org: The target GitHub organization.
+        pending_property_updates: List of (target repo name, properties) tuples queued by process_repository.
+    """
+    written_updates = flush_property_updates(gh, target_org, pending_property_updates)
+    save_processed_repos(Constants.Cache.PROCESSING_STATE_PATH, written_updates)
+
+
+def load_known_missing_repos(cache_path: Path, ttl_days: int) -> dict[str, str]:
+    """
+    Loads the source repositories that returned 404 when forking in previous runs.
+
+    Args:
+        cache_path: Path to the JSON file with the known missing repositories.
+        ttl_days: Number of days after which a missing repository is tried again.
+
+    Returns:
+        A dict mapping lowercase source repository full names to the date they were found missing.
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            known_missing_repos = orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, orjson.JSONDecodeError) as e:
+        logging.warning(f"Could not read known missing repositories from [{cache_path}]: [{e}]")
+        return {}
+
+    cutoff = (datetime.date.today() - datetime.timedelta(days=ttl_days)).isoformat()
+    return {name: found_on for name, found_on in known_missing_repos.items() if found_on >= cutoff}
+
+
+def save_known_missing_repos(cache_path: Path, known_missing_repos: dict[str, str]) -> None:
+    """
+    Saves the source repositories that returned 404 when forking for the next runs.
+
+    Args:
+        cache_path: Path to the JSON file with the known missing repositories.
+        known_missing_repos: A dict mapping lowercase source repository full names to the date they were found missing.
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            f.write(orjson.dumps(known_missing_repos, option=orjson.OPT_SORT_KEYS))
+    except OSError as e:
+        logging.warning(f"Could not save known missing repositories to [{cache_path}]: [{e}]")
+
+
+def collect_unique_sources(github_urls: list[str], known_missing_repos: dict[str, str] | None = None) -> list[str]:
+    """
+    Deduplicates GitHub URLs on the source repository they point to, before any network call.
+
+    Different URLs can point to the same repository (trailing slash, .git suffix, casing, links
+    into the repository), so the first URL seen for each owner/repo is kept.
+
+    Args:
+        github_urls: The GitHub URLs collected by the MCP server loaders.
+        known_missing_repos: Optional dict of source repositories that could not be found in previous runs, these are skipped.
+
+    Returns:
+        The GitHub URLs with one entry per source repository, in their original order.
+    """
+    unique_sources = {}
+    known_missing_count = 0
+    for github_url in github_urls:
+        source_owner, source_repo = extract_repo_owner_name(github_url)
+        if not source_owner or not source_repo:
+            logging.warning(f"Could not parse owner/repo from URL '[{github_url}]'.")
+            continue
+        source_key = f"{source_owner}/{source_repo}".lower()
+        if known_missing_repos and source_key in known_missing_repos:
+            known_missing_count += 1
+            continue
+        unique_sources.setdefault(source_key, github_url)
+
+    if known_missing_count:
+        logging.info(f"Skipped [{known_missing_count}] URLs of source repositories that could not be found in previous runs.")
+    return list(unique_sources.values())
+
+
+def select_repos_to_process(
+    github_urls: list[str],
+    existing_repos_by_name: dict[str, FullRepository],
+    existing_repos_properties: list,
+    target_org: str,
+    processed_repos: set[str],
+    recently_processed_repos: set[str] | None = None
+) -> list[str]:
+    """
+    Drops the GitHub URLs whose fork does not need processing according to the org-wide property listing.
+
+    This is decided locally, so the processing loop and its API calls only run for the repositories
+    that need work, instead of walking through every already processed fork until the limit is reached.
+
+    Args:
+        github_urls: The deduplicated GitHub URLs of the source repositories.
+        existing_repos_by_name: Existing repositories in the target organization, keyed by lowercase full name.
+        existing_repos_properties: The custom property values of all repositories in the target organization.
+        target_org: The target GitHub organization.
+        processed_repos: A set of processed source repository full names, the skipped sources are added.
+        recently_processed_repos: Optional set of lowercase fork names processed by previous runs on this machine,
+                                  see load_recently_processed_repos. These are skipped as well.
+
+    Returns:
+        The GitHub URLs that still need processing, in their original order.
+    """
+    properties_by_name = {
+        repo_properties.repository_name.lower(): {prop.property_name: prop.value for prop in repo_properties.properties}
+        for repo_properties in existing_repos_properties
+    }
+
+    repos_to_process = []
+    for github_url in github_urls:
+        source_owner, source_repo = extract_repo_owner_name(github_url)
+        target_repo_name = get_target_repo_name(source_owner, source_repo)
+        if recently_processed_repos and target_repo_name.lower() in recently_processed_repos:
+            processed_repos.add(f"{source_owner}/{source_repo}")
+            continue
+        properties = properties_by_name.get(target_repo_name.lower())
+        if properties and f"{target_org}/{target_repo_name}".lower() in existing_repos_by_name:
+            try:
+                if not reprocess_repository(properties, verbose=False):
+                    processed_repos.add(f"{source_owner}/{source_repo}")
+                    continue
+            except ValueError:
+                # Reprocess the fork, this writes a valid LastUpdated value again
+                logging.warning(f"Invalid LastUpdated value [{properties.get('LastUpdated')}] for [{target_org}/{target_repo_name}], processing it again.")
+        repos_to_process.append(github_url)
+
+    logging.info(f"Skipping [{len(github_urls) - len(repos_to_process)}] repositories that were processed recently, [{len(repos_to_process)}] left to process.")
+    return repos_to_process
+
+
+def prefetch_repo_states(gh: Any, existing_repos_by_name: dict[str, FullRepository], github_urls: list[str], target_org: str) -> dict[str, dict[str, Any]]:
+    """
+    Fetches the state of the existing forks for a batch of GitHub URLs in a single GraphQL round-trip.
+
+    Only forks that already exist in the target organization are requested, new forks are
+    handled by the REST fallback in process_repository.
+
+    Args:
+        gh: Authenticated GitHub client instance.
+        existing_repos_by_name: Existing repositories in the target organization, keyed by lowercase full name.
+        github_urls: The GitHub URLs of the source repositories in this batch.
+        target_org: The target GitHub organization.
+
+    Returns:
+        A dict mapping target repository names to their state (see batch_fetch_repo_state).
+    """
+    target_repo_names = []
+    for github_url in github_urls:
+        source_owner, source_repo = extract_repo_owner_name(github_url)
+        if source_owner and source_repo:
+            target_repo_name = get_target_repo_name(source_owner, source_repo)
+            if f"{target_org}/{target_repo_name}".lower() in existing_repos_by_name:
+                target_repo_names.append(target_repo_name)
+
+    if not target_repo_names:
+        return {}
+    return batch_fetch_repo_state(gh, target_org, target_repo_names, REPO_STATE_BATCH_SIZE)
+
+
 # Main Logic
 def main():
     start_time = datetime.datetime.now()  # Record start time
+    run_timestamp = start_time.isoformat(timespec="seconds")  # Same LastUpdated for all repos so property updates can be batched
     parser = argparse.ArgumentParser(description="Fork MCP Hub repos and enable GHAS features.")
     # Removed app-id and private-key-path arguments
     parser.add_argument("--target-org", default=Constants.Org.TARGET_ORG, help=f"Target GitHub organization to fork into (default: {Constants.Org.TARGET_ORG})")
@@ -481,130 +958,184 @@ def main():
 
     try:
         # Authentication
-        gh = get_github_client(app_id, private_key)
-
-        # Load all existing repos from the target org
-        existing_repos = list_all_repositories_for_org(gh, args.target_org)
-        existing_repos_properties = list_all_repository_properties_for_org(gh, args.target_org)
-        initial_repo_count = len(existing_repos)  # Store initial count
-
-        # Use all registered MCP server loaders to collect JSON files
-        all_server_repos = []
-        source_counts = {}  # Dictionary to track repositories from each source
-        # Loop through all registered MCP server loaders
-        for loader_func in MCP_SERVER_LOADERS:
-            source_name = loader_func.__name__
-            logging.info(f"Loading MCP servers using: {source_name}")
-            server_files_from_loader = loader_func()
-            if server_files_from_loader:
-                count = len(server_files_from_loader)
-                source_counts[source_name] = count
-                logging.info(f"Found [{count}] repositories from {source_name}")
-                all_server_repos.extend(server_files_from_loader)
-            else:
-                source_counts[source_name] = 0
-
-        # Deduplicate JSON files (in case multiple sources have the same file)
-        all_server_repos = sorted(list(set(all_server_repos)))
-
-        if not all_server_repos:
-            logging.error("No MCP server configurations found. Exiting.")
-            return
-
-        # Limit based on the --num-repos argument
-        num_to_process = args.num_repos
-        logging.info(f"Found a total of [{len(all_server_repos)}] JSON files from all sources. Will process up to [{num_to_process}] repositories based on --num-repos.")
-
-        # Process Repos
-        processed_repo_count = 0  # Counter for successfully processed repos (forked/found + GHAS attempted)
-        dependabot_enabled_count = 0
-        processed_repos = set()  # Keep track of processed source repos to avoid duplicates
-        skipped_non_fork_count = 0  # Track repos skipped because they exist but aren't the correct fork
-        failed_fork_count = 0  # Track repos where fork creation/check failed
-        failed_forks = dict()  # Dict to collect repositories that failed to fork with reasons
-
-        # Iterate over all JSON files until the desired number is processed
-        for github_url in all_server_repos:
-            # Check if we have processed enough repos
-            if processed_repo_count >= num_to_process:
-                logging.info(f"Reached processing limit of [{num_to_process}] repositories.")
-                break
-
-            # Call the helper function to process this specific repo
-            processed_inc, dependabot_inc, skipped_non_fork, failed_fork = process_repository(
-                existing_repos,
-                github_url,
-                gh,
-                args.target_org,
-                existing_repos_properties,
-                processed_repos,  # Pass the set (it will be modified in place)
-                failed_forks  # Pass the dict to collect failed forks with reasons
+        gh = get_github_client(app_id, private_key, Constants.Cache.HTTP_CACHE_PATH, Constants.Cache.HTTP_CACHE_TTL_SECONDS)
+
+        # Keep a single HTTP client (and its connection pool) open for the whole run
+        with gh:
+            # Load all existing repos from the target org
+            existing_repos = list_all_repositories_for_org(gh, args.target_org)
+            existing_repos_properties = list_all_repository_properties_for_org(gh, args.target_org)
+            initial_repo_count = len(existing_repos)  # Store initial count
+            # Index the existing repos by lowercase full name for constant time lookups
+            existing_repos_by_name = {repo.full_name.lower(): repo for repo in existing_repos}
+
+            # Use all registered MCP server loaders to collect JSON files
+            all_server_repos = []
+            source_counts = {}  # Dictionary to track repositories from each source
+            # Loop through all registered MCP server loaders
+            for loader_func in MCP_SERVER_LOADERS:
+                source_name = loader_func.__name__
+                logging.info(f"Loading MCP servers using: {source_name}")
+                server_files_from_loader = loader_func()
+                if server_files_from_loader:
+                    count = len(server_files_from_loader)
+                    source_counts[source_name] = count
+                    logging.info(f"Found [{count}] repositories from {source_name}")
+                    all_server_repos.extend(server_files_from_loader)
+                else:
+                    source_counts[source_name] = 0
+
+            # Deduplicate on the source repository (in case multiple sources list the same repo),
+            # the loaders return their URLs in a stable order so the result is the same on every run
+            known_missing_repos = load_known_missing_repos(Constants.Cache.KNOWN_MISSING_REPOS_PATH, Constants.Cache.KNOWN_MISSING_REPOS_TTL_DAYS)
+            all_server_repos = collect_unique_sources(all_server_repos, known_missing_repos)
+
+            if not all_server_repos:
+                logging.error("No MCP server configurations found. Exiting.")
+                return
+
+            # Limit based on the --num-repos argument
+            num_to_process = args.num_repos
+            logging.info(f"Found a total of [{len(all_server_repos)}] JSON files from all sources. Will process up to [{num_to_process}] repositories based on --num-repos.")
+
+            # Process Repos
+            processed_repo_count = 0  # Counter for successfully processed repos (forked/found + GHAS attempted)
+            dependabot_enabled_count = 0
+            processed_repos = set()  # Keep track of processed source repos to avoid duplicates
+            skipped_non_fork_count = 0  # Track repos skipped because they exist but aren't the correct fork
+            failed_fork_count = 0  # Track repos where fork creation/check failed
+            failed_forks = dict()  # Dict to collect repositories that failed to fork with reasons
+            repo_states = dict()  # Prefetched fork state, filled one GraphQL batch at a time
+            pending_property_updates = []  # Property updates written in bulk after the loop
+            pending_new_forks = []  # Forks created in this run, finished once GitHub has created them
+            # The worker threads only change these collections with single add, append and item assignment calls,
+            # which are atomic on built-in types, so they are shared without a lock and read after each wave
+
+            # Only walk the repositories that still need processing, skipping the recently processed forks locally
+            recently_processed_repos = load_recently_processed_repos(Constants.Cache.PROCESSING_STATE_PATH, Constants.Cache.REPROCESS_AFTER_DAYS)
+            repos_to_process = select_repos_to_process(
+                all_server_repos, existing_repos_by_name, existing_repos_properties, args.target_org, processed_repos,
+                recently_processed_repos
             )
 
-            # Update counters based on the result from the helper function
-            processed_repo_count += processed_inc
-            dependabot_enabled_count += dependabot_inc
-            skipped_non_fork_count += 1 if skipped_non_fork else 0
-            failed_fork_count += 1 if failed_fork else 0
-            if processed_inc or skipped_non_fork or failed_fork:  # Log separator only if something happened
-                logging.info("")
-
-        # Reporting
-        logging.info("")
-        end_time = datetime.datetime.now()  # Record end time
-        duration = end_time - start_time
-        final_repo_count = len(list_all_repositories_for_org(gh, args.target_org))  # Get updated count
-
-        # Prepare summary messages
-        summary_lines = [
-            "**MCP Repository Processing Summary**",
-            "Security Scan Results",
-            f"- Total MCP server configs found: `{len(all_server_repos)}`",
-            f"- Total MCP servers found: `{len(processed_repos)}`",
-            f"- Processing Limit (--num-repos): `{num_to_process}`",
-            f"- Unique source repositories encountered: `{len(processed_repos)}`",
-            f"- New repositories successfully processed (forked/found & GHAS enabled): `{processed_repo_count}`",
-            f"- Repositories skipped (exist but not correct fork): `{skipped_non_fork_count}`",
-            f"- Repositories failed (fork creation/check error): `{failed_fork_count}`",
-            f"- Repositories among processed with Dependabot config: `{dependabot_enabled_count}`",
-            f"- Initial repositories in target org `{args.target_org}`: `{initial_repo_count}`",
-            f"- Final repositories in target org `{args.target_org}`: `{final_repo_count}`",
-            f"- Total execution time: `{duration}`",
-            ""
-        ]
-
-        # Add source counts to summary
-        if source_counts:
-            summary_lines.append("\nDistinct Source Counts:")
-            for source_name, count in source_counts.items():
-                # Format the source name for better readability
-                display_name = source_name.replace("load_mcp_servers_from_", "")
-                summary_lines.append(f"- `{display_name}`: `{count}`")
-
-        # Add failed forks list with reasons if any exist
-        if failed_forks:
-            summary_lines.append("Failed Repository Details:")
-            for failed_repo, reason in sorted(failed_forks.items()):  # Sort for consistent output
-                summary_lines.append(f"1. `{failed_repo}`: {reason}")
-
-        # Log summary to console
-        logging.info("Processing Summary")
-        for line in summary_lines[1:]:  # Skip the markdown title for console
-            logging.info(line.replace('`', '').replace('*', ''))  # Clean markdown for console
-        show_rate_limit(gh)
-        logging.info(f"Total execution time: [{duration}]")  # Repeat duration for clarity
-
-        # Write summary to GITHUB_STEP_SUMMARY if available
-        summary_file_path = os.getenv("GITHUB_STEP_SUMMARY")
-        if summary_file_path:
+            # Write the finished updates even if the run fails, the forks were already changed
             try:
-                with open(summary_file_path, "a") as summary_file:  # Append mode
-                    summary_file.write("\n".join(summary_lines) + "\n\n")
-                logging.info(f"Successfully appended summary to GITHUB_STEP_SUMMARY file: [{summary_file_path}]")
-            except Exception as e:
-                logging.error(f"Failed to write to GITHUB_STEP_SUMMARY file [{summary_file_path}]: [{e}]")
-        else:
-            logging.info("GITHUB_STEP_SUMMARY environment variable not set. Skipping summary file output.")
+                # Process the remaining repositories concurrently, in waves no larger than the number still needed
+                index = 0
+                prefetched_until = 0
+                with ThreadPoolExecutor(max_workers=PROCESSING_WORKERS) as executor:
+                    while index < len(repos_to_process) and processed_repo_count < num_to_process:
+                        wave_size = min(PROCESSING_WORKERS, num_to_process - processed_repo_count)
+                        wave_urls = repos_to_process[index:index + wave_size]
+
+                        # Prefetch the state of the next batch of existing forks in one GraphQL query
+                        if index + len(wave_urls) > prefetched_until:
+                            batch_urls = repos_to_process[prefetched_until:prefetched_until + REPO_STATE_BATCH_SIZE]
+                            repo_states.update(prefetch_repo_states(gh, existing_repos_by_name, batch_urls, args.target_org))
+                            prefetched_until += REPO_STATE_BATCH_SIZE
+                        index += len(wave_urls)
+
+                        # Run every repository in a copy of the current context, so the workers share the open GitHub client
+                        futures = [
+                            executor.submit(
+                                contextvars.copy_context().run,
+                                process_repository,
+                                existing_repos_by_name,
+                                github_url,
+                                gh,
+                                args.target_org,
+                                processed_repos,  # Pass the set (it will be modified in place)
+                                failed_forks,  # Pass the dict to collect failed forks with reasons
+                                repo_states,
+                                pending_property_updates,
+                                known_missing_repos,
+                                run_timestamp,
+                                pending_new_forks
+                            )
+                            for github_url in wave_urls
+                        ]
+
+                        for future in as_completed(futures):
+                            processed_inc, dependabot_inc, skipped_non_fork, failed_fork = future.result()
+
+                            # Update counters based on the result from the helper function
+                            processed_repo_count += processed_inc
+                            dependabot_enabled_count += dependabot_inc
+                            skipped_non_fork_count += 1 if skipped_non_fork else 0
+                            failed_fork_count += 1 if failed_fork else 0
+
+                    if processed_repo_count >= num_to_process:
+                        logging.info(f"Reached processing limit of [{num_to_process}] repositories.")
+
+                # Wait for the new forks in bulk and enable GHAS on them
+                if pending_new_forks:
+                    new_fork_dependabot_count, new_fork_failed_count = finish_new_forks(
+                        gh, args.target_org, pending_new_forks, failed_forks, run_timestamp, pending_property_updates
+                    )
+                    dependabot_enabled_count += new_fork_dependabot_count
+                    processed_repo_count -= new_fork_failed_count
+                    failed_fork_count += new_fork_failed_count
+            finally:
+                # Write the queued property updates in bulk
+                write_property_updates(gh, args.target_org, pending_property_updates)
+                save_known_missing_repos(Constants.Cache.KNOWN_MISSING_REPOS_PATH, known_missing_repos)
+
+            # Reporting
+            logging.info("")
+            end_time = datetime.datetime.now()  # Record end time
+            duration = end_time - start_time
+            final_repo_count = initial_repo_count + len(pending_new_forks)  # Every new fork adds one repository
+
+            # Prepare summary messages
+            summary_lines = [
+                "**MCP Repository Processing Summary**",
+                "Security Scan Results",
+                f"- Total MCP server configs found: `{len(all_server_repos)}`",
+                f"- Total MCP servers found: `{len(processed_repos)}`",
+                f"- Processing Limit (--num-repos): `{num_to_process}`",
+                f"- Unique source repositories encountered: `{len(processed_repos)}`",
+                f"- New repositories successfully processed (forked/found & GHAS enabled): `{processed_repo_count}`",
+                f"- Repositories skipped (exist but not correct fork): `{skipped_non_fork_count}`",
+                f"- Repositories failed (fork creation/check error): `{failed_fork_count}`",
+                f"- Repositories among processed with Dependabot config: `{dependabot_enabled_count}`",
+                f"- Initial repositories in target org `{args.target_org}`: `{initial_repo_count}`",
+                f"- Final repositories in target org `{args.target_org}`: `{final_repo_count}`",
+                f"- Total execution time: `{duration}`",
+                ""
+            ]
+
+            # Add source counts to summary
+            if source_counts:
+                summary_lines.append("\nDistinct Source Counts:")
+                for source_name, count in source_counts.items():
+                    # Format the source name for better readability
+                    display_name = source_name.replace("load_mcp_servers_from_", "")
+                    summary_lines.append(f"- `{display_name}`: `{count}`")
+
+            # Add failed forks list with reasons if any exist
+            if failed_forks:
+                summary_lines.append("Failed Repository Details:")
+                for failed_repo, reason in sorted(failed_forks.items()):  # Sort for consistent output
+                    summary_lines.append(f"1. `{failed_repo}`: {reason}")
+
+            # Log summary to console
+            logging.info("Processing Summary")
+            for line in summary_lines[1:]:  # Skip the markdown title for console
+                logging.info(line.replace('`', '').replace('*', ''))  # Clean markdown for console
+            show_rate_limit(gh)
+            logging.info(f"Total execution time: [{duration}]")  # Repeat duration for clarity
+
+            # Write summary to GITHUB_STEP_SUMMARY if available
+            summary_file_path = os.getenv("GITHUB_STEP_SUMMARY")
+            if summary_file_path:
+                try:
+                    with open(summary_file_path, "a") as summary_file:  # Append mode
+                        summary_file.write("\n".join(summary_lines) + "\n\n")
+                    logging.info(f"Successfully appended summary to GITHUB_STEP_SUMMARY file: [{summary_file_path}]")
+                except Exception as e:
+                    logging.error(f"Failed to write to GITHUB_STEP_SUMMARY file [{summary_file_path}]: [{e}]")
+            else:
+                logging.info("GITHUB_STEP_SUMMARY environment variable not set. Skipping summary file output.")
 
     except Exception as e:
         logging.error(f"Script failed with an error: [{e}]")
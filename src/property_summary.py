@@ -2,18 +2,18 @@
 
 import argparse
 import datetime
-import json
 import logging
 import os
 import sys
 from collections import defaultdict, Counter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
+import orjson
 from dotenv import load_dotenv
 
 from .github import (
     get_github_client,
-    list_all_repository_properties_for_org,
+    iter_repository_properties_for_org,
     show_rate_limit
 )
 from .constants import Constants
@@ -25,18 +25,49 @@ logging.basicConfig(
 logging.getLogger("githubkit").setLevel(logging.WARNING)
 load_dotenv()
 
+# Number of example repositories kept for each property value
+MAX_EXAMPLE_REPOS = 5
 
-def analyze_property_values(all_properties: List[Any]) -> Dict[str, Any]:
+# Characters a numeric property value can start with, other strings are not parsed as numbers
+NUMERIC_START_CHARACTERS = frozenset("0123456789+-.")
+
+# Properties with at most this many unique values have all of them listed in the text report
+MAX_LISTED_UNIQUE_VALUES = 20
+
+
+def sort_unique_values(values) -> List[Any]:
+    """
+    Sorts property values with None values first, falling back to string order for mixed types.
+
+    Args:
+        values: The unique values of a property
+
+    Returns:
+        The sorted list of values
+    """
+    none_values, non_none_values = [], []
+    for value in values:
+        (none_values if value is None else non_none_values).append(value)
+
+    try:
+        sorted_non_none = sorted(non_none_values)
+    except TypeError:
+        # If we can't sort due to mixed types, convert all to strings
+        sorted_non_none = sorted(non_none_values, key=str)
+
+    return none_values + sorted_non_none
+
+
+def analyze_property_values(all_properties: Iterable[Any]) -> Dict[str, Any]:
     """
     Analyzes all repository properties and generates a summary.
 
     Args:
-        all_properties: List of repository property objects from GitHub API
+        all_properties: Repository property objects from GitHub API, consumed in a single pass
 
     Returns:
         Dictionary containing analysis results
     """
-    logging.info(f"Analyzing properties for [{len(all_properties)}] repositories...")
 
     # Initialize analysis structures with explicit typing
     property_stats: Dict[str, Dict[str, Any]] = {}
@@ -60,85 +91,93 @@ def analyze_property_values(all_properties: List[Any]) -> Dict[str, Any]:
                 prop_name = prop.property_name
                 prop_value = prop.value
 
-                # Initialize property stats if not seen before
+                # Initialize property stats if not seen before, only running totals and a few examples are kept
                 if prop_name not in property_stats:
                     property_stats[prop_name] = {
                         'total_repos_with_property': 0,
-                        'unique_values': set(),
                         'value_counts': Counter(),
-                        'numeric_values': [],
-                        'repositories': [],
-                        'value_to_repos': defaultdict(list)
+                        'value_to_example_repos': defaultdict(list),
+                        'numeric_count': 0,
+                        'numeric_total': 0.0,
+                        'numeric_non_zero': 0,
+                        'numeric_min': None,
+                        'numeric_max': None
                     }
 
                 # Update statistics for this property
                 stats = property_stats[prop_name]
                 stats['total_repos_with_property'] += 1
-                stats['unique_values'].add(prop_value)
                 stats['value_counts'][prop_value] += 1
-                stats['repositories'].append(repo_name)
-                stats['value_to_repos'][prop_value].append(repo_name)
-
-                # Try to parse as numeric value for additional analysis
-                try:
+                example_repos = stats['value_to_example_repos'][prop_value]
+                if len(example_repos) < MAX_EXAMPLE_REPOS:
+                    example_repos.append(repo_name)
+
+                # Try to parse as numeric value for additional analysis, skipping the values that
+                # can't be numbers without raising an exception for every label-like value
+                if isinstance(prop_value, str):
+                    if not prop_value or prop_value[0] not in NUMERIC_START_CHARACTERS:
+                        continue
+                    try:
+                        numeric_value = float(prop_value)
+                    except ValueError:
+                        # Not a numeric value, that's fine
+                        continue
+                elif isinstance(prop_value, (int, float)):
                     numeric_value = float(prop_value)
-                    stats['numeric_values'].append(numeric_value)
-                except (ValueError, TypeError):
-                    # Not a numeric value, that's fine
-                    pass
+                else:
+                    continue
+                stats['numeric_count'] += 1
+                stats['numeric_total'] += numeric_value
+                if numeric_value != 0:
+                    stats['numeric_non_zero'] += 1
+                if stats['numeric_min'] is None or numeric_value < stats['numeric_min']:
+                    stats['numeric_min'] = numeric_value
+                if stats['numeric_max'] is None or numeric_value > stats['numeric_max']:
+                    stats['numeric_max'] = numeric_value
 
     # Calculate summary statistics for each property
     summary_stats = {}
     for prop_name, stats in property_stats.items():
-        # Handle None values in sorting - put None values first, then sort the rest
-        unique_values_list = list(stats['unique_values'])
-        none_values = [v for v in unique_values_list if v is None]
-        non_none_values = [v for v in unique_values_list if v is not None]
-
-        # Sort non-None values, handling mixed types gracefully
-        try:
-            sorted_non_none = sorted(non_none_values)
-        except TypeError:
-            # If we can't sort due to mixed types, convert all to strings
-            sorted_non_none = sorted(non_none_values, key=str)
-
-        # Combine None values (first) with sorted non-None values
-        all_sorted_values = none_values + sorted_non_none
+        if len(stats['value_counts']) <= MAX_LISTED_UNIQUE_VALUES:
+            all_sorted_values = sort_unique_values(stats['value_counts'])
+        else:
+            # Only listed in the JSON summary, which sorts the values itself
+            all_sorted_values = list(stats['value_counts'])
 
+        most_common_values = stats['value_counts'].most_common(10)
         prop_summary = {
             'total_repos_with_property': stats['total_repos_with_property'],
-            'unique_value_count': len(stats['unique_values']),
-            'most_common_values': stats['value_counts'].most_common(10),
+            'unique_value_count': len(stats['value_counts']),
+            'most_common_values': most_common_values,
             'all_unique_values': all_sorted_values,
-            'most_common_with_examples': []  # Will contain tuples of (value, count, example_repos)
+            # Tuples of (value, count, example_repos), the examples were already limited while aggregating
+            'most_common_with_examples': [
+                (value, count, stats['value_to_example_repos'][value]) for value, count in most_common_values
+            ]
         }
 
-        # Create most common values with repository examples
-        for value, count in stats['value_counts'].most_common(10):
-            example_repos = stats['value_to_repos'][value][:5]  # Get up to 5 examples
-            prop_summary['most_common_with_examples'].append((value, count, example_repos))
-
         # Add numeric statistics if we have numeric values
-        if stats['numeric_values']:
-            numeric_vals = stats['numeric_values']
+        if stats['numeric_count']:
             prop_summary['numeric_stats'] = {
-                'min': min(numeric_vals),
-                'max': max(numeric_vals),
-                'avg': sum(numeric_vals) / len(numeric_vals),
-                'total': sum(numeric_vals),
-                'count_non_zero': len([v for v in numeric_vals if v != 0]),
-                'count_zero': len([v for v in numeric_vals if v == 0])
+                'min': stats['numeric_min'],
+                'max': stats['numeric_max'],
+                'avg': stats['numeric_total'] / stats['numeric_count'],
+                'total': stats['numeric_total'],
+                'count_non_zero': stats['numeric_non_zero'],
+                'count_zero': stats['numeric_count'] - stats['numeric_non_zero']
             }
 
         summary_stats[prop_name] = prop_summary
 
+    logging.info(f"Analyzed properties for [{repos_analyzed}] repositories")
+
     # Overall summary
     overall_summary = {
         'total_repositories_analyzed': repos_analyzed,
         'repositories_with_properties': repos_with_properties,
         'repositories_without_properties': repos_analyzed - repos_with_properties,
         'total_properties_found': total_properties_found,
-        'unique_property_names': sorted(list(property_stats.keys())),
+        'unique_property_names': sorted(property_stats),
         'property_count': len(property_stats),
         'analysis_timestamp': datetime.datetime.now().isoformat()
     }
@@ -172,75 +211,79 @@ def generate_property_summary_report(analysis_results: Dict[str, Any], target_or
     report_filename = f"property_summary_{target_org}_{timestamp}.txt"
     report_path = Path(output_dir) / report_filename
 
-    with open(report_path, 'w') as f:
-        # Write header
-        f.write("=" * 80 + "\n")
-        f.write("REPOSITORY PROPERTY SUMMARY REPORT\n")
-        f.write(f"Organization: [{target_org}]\n")
-        f.write(f"Generated: [{overall['analysis_timestamp']}]\n")
-        f.write("=" * 80 + "\n\n")
-
-        # Write overall summary
-        f.write("OVERALL SUMMARY\n")
-        f.write("-" * 40 + "\n")
-        f.write(f"Total repositories analyzed: [{overall['total_repositories_analyzed']}]\n")
-        f.write(f"Repositories with properties: [{overall['repositories_with_properties']}]\n")
-        f.write(f"Repositories without properties: [{overall['repositories_without_properties']}]\n")
-        f.write(f"Total properties found: [{overall['total_properties_found']}]\n")
-        f.write(f"Unique property names: [{overall['property_count']}]\n")
-        f.write(f"Property coverage: [{(overall['repositories_with_properties'] / overall['total_repositories_analyzed'] * 100):.1f}%]\n")
-        f.write("\n")
-
-        # Write property names list
-        f.write("PROPERTY NAMES FOUND\n")
-        f.write("-" * 40 + "\n")
-        for i, prop_name in enumerate(overall['unique_property_names'], 1):
-            f.write(f"  [{i:2d}]. [{prop_name}]\n")
-        f.write("\n")
-
-        # Write detailed property analysis
-        f.write("DETAILED PROPERTY ANALYSIS\n")
-        f.write("=" * 80 + "\n")
-
-        for prop_name in sorted(properties.keys()):
-            prop_data = properties[prop_name]
-            f.write(f"\nProperty: [{prop_name}]\n")
-            f.write("-" * (len(prop_name) + 12) + "\n")
-            f.write(f"Repositories with this property: [{prop_data['total_repos_with_property']}]\n")
-            f.write(f"Unique values: [{prop_data['unique_value_count']}]\n")
-
-            # Write numeric statistics if available
-            if 'numeric_stats' in prop_data:
-                stats = prop_data['numeric_stats']
-                f.write("Numeric Statistics:\n")
-                f.write(f"  Total sum: [{stats['total']:.1f}]\n")
-                f.write(f"  Average: [{stats['avg']:.2f}]\n")
-                f.write(f"  Min: [{stats['min']:.1f}]\n")
-                f.write(f"  Max: [{stats['max']:.1f}]\n")
-                f.write(f"  Non-zero values: [{stats['count_non_zero']}]\n")
-                f.write(f"  Zero values: [{stats['count_zero']}]\n")
-
-            # Write most common values with repository examples
-            f.write("Most common values:\n")
-            for value, count, example_repos in prop_data['most_common_with_examples']:
-                percentage = (count / prop_data['total_repos_with_property']) * 100
-                f.write(f"  '{value}': [{count}] repositories ([{percentage:.1f}%])\n")
-
-                # Show repository examples, with special attention to SecretAlerts_Total
-                if example_repos:
-                    if prop_name == "SecretAlerts_Total" or len(example_repos) > 0:
-                        example_text = ", ".join(example_repos)
-                        if len(example_repos) < count:
-                            f.write(f"    Example repositories: [{example_text}]... (and [{count - len(example_repos)}] others)\n")
-                        else:
-                            f.write(f"    Example repositories: [{example_text}]\n")
-                f.write("\n")
-
-            # If there are few unique values, list them all
-            if prop_data['unique_value_count'] <= 20:
-                f.write(f"All unique values: {prop_data['all_unique_values']}\n")
-
-            f.write("\n")
+    # Collect the report in memory and write it with a single call
+    parts = []
+
+    # Write header
+    parts.append("=" * 80 + "\n")
+    parts.append("REPOSITORY PROPERTY SUMMARY REPORT\n")
+    parts.append(f"Organization: [{target_org}]\n")
+    parts.append(f"Generated: [{overall['analysis_timestamp']}]\n")
+    parts.append("=" * 80 + "\n\n")
+
+    # Write overall summary
+    parts.append("OVERALL SUMMARY\n")
+    parts.append("-" * 40 + "\n")
+    parts.append(f"Total repositories analyzed: [{overall['total_repositories_analyzed']}]\n")
+    parts.append(f"Repositories with properties: [{overall['repositories_with_properties']}]\n")
+    parts.append(f"Repositories without properties: [{overall['repositories_without_properties']}]\n")
+    parts.append(f"Total properties found: [{overall['total_properties_found']}]\n")
+    parts.append(f"Unique property names: [{overall['property_count']}]\n")
+    parts.append(f"Property coverage: [{(overall['repositories_with_properties'] / overall['total_repositories_analyzed'] * 100):.1f}%]\n")
+    parts.append("\n")
+
+    # Write property names list
+    parts.append("PROPERTY NAMES FOUND\n")
+    parts.append("-" * 40 + "\n")
+    for i, prop_name in enumerate(overall['unique_property_names'], 1):
+        parts.append(f"  [{i:2d}]. [{prop_name}]\n")
+    parts.append("\n")
+
+    # Write detailed property analysis
+    parts.append("DETAILED PROPERTY ANALYSIS\n")
+    parts.append("=" * 80 + "\n")
+
+    for prop_name in sorted(properties.keys()):
+        prop_data = properties[prop_name]
+        parts.append(f"\nProperty: [{prop_name}]\n")
+        parts.append("-" * (len(prop_name) + 12) + "\n")
+        parts.append(f"Repositories with this property: [{prop_data['total_repos_with_property']}]\n")
+        parts.append(f"Unique values: [{prop_data['unique_value_count']}]\n")
+
+        # Write numeric statistics if available
+        if 'numeric_stats' in prop_data:
+            stats = prop_data['numeric_stats']
+            parts.append("Numeric Statistics:\n")
+            parts.append(f"  Total sum: [{stats['total']:.1f}]\n")
+            parts.append(f"  Average: [{stats['avg']:.2f}]\n")
+            parts.append(f"  Min: [{stats['min']:.1f}]\n")
+            parts.append(f"  Max: [{stats['max']:.1f}]\n")
+            parts.append(f"  Non-zero values: [{stats['count_non_zero']}]\n")
+            parts.append(f"  Zero values: [{stats['count_zero']}]\n")
+
+        # Write most common values with repository examples
+        parts.append("Most common values:\n")
+        for value, count, example_repos in prop_data['most_common_with_examples']:
+            percentage = (count / prop_data['total_repos_with_property']) * 100
+            parts.append(f"  '{value}': [{count}] repositories ([{percentage:.1f}%])\n")
+
+            # Show repository examples, with special attention to SecretAlerts_Total
+            if example_repos:
+                if prop_name == "SecretAlerts_Total" or len(example_repos) > 0:
+                    example_text = ", ".join(example_repos)
+                    if len(example_repos) < count:
+                        parts.append(f"    Example repositories: [{example_text}]... (and [{count - len(example_repos)}] others)\n")
+                    else:
+                        parts.append(f"    Example repositories: [{example_text}]\n")
+            parts.append("\n")
+
+        # If there are few unique values, list them all
+        if prop_data['unique_value_count'] <= MAX_LISTED_UNIQUE_VALUES:
+            parts.append(f"All unique values: {prop_data['all_unique_values']}\n")
+
+        parts.append("\n")
+
+    report_path.write_text("".join(parts))
 
     logging.info(f"Property summary report saved to [{report_path}]")
     return str(report_path)
@@ -273,20 +316,9 @@ def generate_json_summary(analysis_results: Dict[str, Any], target_org: str, out
             json_data[key] = {}
             for prop_name, prop_data in value.items():
                 json_prop_data = dict(prop_data)
-                # Convert set to list and handle None values in sorting
-                unique_values_list = list(prop_data['all_unique_values'])
-                none_values = [v for v in unique_values_list if v is None]
-                non_none_values = [v for v in unique_values_list if v is not None]
-
-                # Sort non-None values, handling mixed types gracefully
-                try:
-                    sorted_non_none = sorted(non_none_values)
-                except TypeError:
-                    # If we can't sort due to mixed types, convert all to strings
-                    sorted_non_none = sorted(non_none_values, key=str)
-
-                # Combine None values (first) with sorted non-None values
-                json_prop_data['all_unique_values'] = none_values + sorted_non_none
+                # analyze_property_values only sorts the values of properties listed in the text report
+                if prop_data['unique_value_count'] > MAX_LISTED_UNIQUE_VALUES:
+                    json_prop_data['all_unique_values'] = sort_unique_values(prop_data['all_unique_values'])
 
                 # Convert most_common_with_examples tuples to dictionaries for JSON
                 json_prop_data['most_common_with_examples'] = [
@@ -303,8 +335,8 @@ def generate_json_summary(analysis_results: Dict[str, Any], target_org: str, out
         else:
             json_data[key] = value
 
-    with open(json_path, 'w') as f:
-        json.dump(json_data, f, indent=2, default=str)
+    with open(json_path, 'wb') as f:
+        f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
 
     logging.info(f"Property summary JSON saved to [{json_path}]")
     return str(json_path)
@@ -346,46 +378,45 @@ def main():
         # --- Authentication ---
         gh = get_github_client(app_id, private_key)
 
-        # Show initial rate limit
-        show_rate_limit(gh)
-
-        # --- Load all repository properties ---
-        logging.info(f"Loading all repository properties for organization [{args.target_org}]...")
-        all_properties = list_all_repository_properties_for_org(gh, args.target_org)
+        # Keep a single HTTP client (and its connection pool) open for all API calls
+        with gh:
+            # Show initial rate limit
+            show_rate_limit(gh)
 
-        if not all_properties:
-            logging.warning(f"No repository properties found for organization [{args.target_org}]")
-            sys.exit(0)
+            # --- Load and analyze all repository properties ---
+            # The pages are analyzed while they are fetched, so the full list is never kept in memory
+            logging.info(f"Loading and analyzing all repository properties for organization [{args.target_org}]...")
+            analysis_results = analyze_property_values(iter_repository_properties_for_org(gh, args.target_org))
 
-        # --- Analyze properties ---
-        logging.info("Analyzing repository properties...")
-        analysis_results = analyze_property_values(all_properties)
+            if not analysis_results['overall_summary']['total_repositories_analyzed']:
+                logging.warning(f"No repository properties found for organization [{args.target_org}]")
+                sys.exit(0)
 
-        # --- Generate reports ---
-        logging.info("Generating summary reports...")
+            # --- Generate reports ---
+            logging.info("Generating summary reports...")
 
-        # Always generate JSON
-        json_path = generate_json_summary(analysis_results, args.target_org, args.output_dir)
+            # Always generate JSON
+            json_path = generate_json_summary(analysis_results, args.target_org, args.output_dir)
 
-        # Generate text report unless json-only is specified
-        if not args.json_only:
-            text_path = generate_property_summary_report(analysis_results, args.target_org, args.output_dir)
-            logging.info(f"Text report generated: [{text_path}]")
+            # Generate text report unless json-only is specified
+            if not args.json_only:
+                text_path = generate_property_summary_report(analysis_results, args.target_org, args.output_dir)
+                logging.info(f"Text report generated: [{text_path}]")
 
-        logging.info(f"JSON summary generated: [{json_path}]")
+            logging.info(f"JSON summary generated: [{json_path}]")
 
-        # Show final rate limit
-        show_rate_limit(gh)
+            # Show final rate limit
+            show_rate_limit(gh)
 
-        # Print execution summary
-        end_time = datetime.datetime.now()
-        execution_time = end_time - start_time
+            # Print execution summary
+            end_time = datetime.datetime.now()
+            execution_time = end_time - start_time
 
-        overall = analysis_results['overall_summary']
-        logging.info(f"Property analysis completed in [{execution_time}]")
-        logging.info(f"Analyzed [{overall['total_repositories_analyzed']}] repositories")
-        logging.info(f"Found [{overall['property_count']}] unique property types")
-        logging.info(f"Total properties: [{overall['total_properties_found']}]")
+            overall = analysis_results['overall_summary']
+            logging.info(f"Property analysis completed in [{execution_time}]")
+            logging.info(f"Analyzed [{overall['total_repositories_analyzed']}] repositories")
+            logging.info(f"Found [{overall['property_count']}] unique property types")
+            logging.info(f"Total properties: [{overall['total_properties_found']}]")
 
     except KeyboardInterrupt:
         logging.info("Operation cancelled by user.")
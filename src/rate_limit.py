@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+import anyio
+import httpx
+from githubkit.throttling import LocalThrottler
+
+# Methods GitHub counts as a single point towards the secondary rate limit, other REST methods cost 5 points
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class PointsThrottler(LocalThrottler):
+    """
+    githubkit throttler that limits concurrency and keeps requests under GitHub's secondary rate limit.
+
+    GitHub allows a limited number of points per minute, a GET, HEAD or OPTIONS request (and a GraphQL query)
+    costs 1 point and any other REST request costs 5 points. The points refill continuously like a token
+    bucket, a request that does not have enough points waits until they are refilled before it is sent.
+    """
+
+    def __init__(self, max_concurrency: int, points_per_minute: int = 900) -> None:
+        super().__init__(max_concurrency)
+        self.points_per_minute = points_per_minute
+        self._points = float(points_per_minute)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def request_cost(request: httpx.Request) -> int:
+        """Returns the number of secondary rate limit points the request costs."""
+        if request.method in READ_METHODS or request.url.path.endswith("/graphql"):
+            return 1
+        return 5
+
+    def reserve(self, cost: int) -> float:
+        """
+        Takes the points for a request from the bucket.
+
+        The bucket can go below zero, later requests then wait for the points that were taken in advance.
+
+        Returns:
+            The number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            refilled = (now - self._updated_at) * self.points_per_minute / 60
+            self._points = min(float(self.points_per_minute), self._points + refilled) - cost
+            self._updated_at = now
+            if self._points >= 0:
+                return 0.0
+            return -self._points * 60 / self.points_per_minute
+
+    @contextmanager
+    def acquire(self, request: httpx.Request) -> Generator[None, Any, Any]:
+        with self.semaphore:
+            delay = self.reserve(self.request_cost(request))
+            if delay:
+                time.sleep(delay)
+            yield
+
+    @asynccontextmanager
+    async def async_acquire(self, request: httpx.Request) -> AsyncGenerator[None, Any]:
+        async with self.async_semaphore:
+            delay = self.reserve(self.request_cost(request))
+            if delay:
+                await anyio.sleep(delay)
+            yield
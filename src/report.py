@@ -5,41 +5,65 @@ import sys
 import argparse
 import logging
 import datetime
-import json
+import heapq
+import operator
 from pathlib import Path
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Union
+from collections import Counter, defaultdict
+import orjson
 from dotenv import load_dotenv
 
 # Import the local functions
 from .github import (
-    get_github_client, list_all_repository_properties_for_org,
+    get_github_client, iter_repository_properties_for_org,
     show_rate_limit
 )
 from .constants import Constants
-from .analyze import _parse_secret_types_from_storage
+from .functions import _parse_secret_types_from_storage
 
 # Configuration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logging.getLogger("githubkit").setLevel(logging.WARNING)  # Reduce verbosity from githubkit
-load_dotenv()  # Load environment variables from .env file
 
 REPORT_DIR = "reports"  # Directory to save reports
+REPORT_FILENAME_DATE_FORMAT = '%Y%m%d'  # Date format used in the report filenames
+REPORT_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'  # Timestamp format shown in the markdown report
+
+# Alert count properties read for every repository, in the order generate_report unpacks them
+ALERT_COUNT_PROPERTIES = (
+    Constants.AlertProperties.CODE_ALERTS,
+    Constants.AlertProperties.SECRET_ALERTS_TOTAL,
+    Constants.AlertProperties.DEPENDENCY_ALERTS,
+    Constants.AlertProperties.CODE_ALERTS_CRITICAL,
+    Constants.AlertProperties.CODE_ALERTS_HIGH,
+    Constants.AlertProperties.CODE_ALERTS_MEDIUM,
+    Constants.AlertProperties.CODE_ALERTS_LOW,
+    Constants.AlertProperties.DEPENDENCY_ALERTS_CRITICAL,
+    Constants.AlertProperties.DEPENDENCY_ALERTS_HIGH,
+    Constants.AlertProperties.DEPENDENCY_ALERTS_MODERATE,
+    Constants.AlertProperties.DEPENDENCY_ALERTS_LOW,
+)
+ALERT_COUNT_SLOTS = {name: slot for slot, name in enumerate(ALERT_COUNT_PROPERTIES)}
+# Keys of the per-date alert counts in the report, in the same order as ALERT_COUNT_PROPERTIES
+DATE_ALERT_KEYS = (
+    'code', 'secret', 'dependency',
+    'code_critical', 'code_high', 'code_medium', 'code_low',
+    'dependency_critical', 'dependency_high', 'dependency_moderate', 'dependency_low',
+)
 
-def parse_iso_date(date_string: str) -> Optional[datetime.datetime]:
+def get_date_key(date_string: str) -> Optional[str]:
     """
-    Parse an ISO format date string to a datetime object.
+    Get the YYYY-MM-DD date key of an ISO format date string without parsing it to a datetime.
 
     Args:
         date_string: ISO format date string.
 
     Returns:
-        datetime object or None if parsing fails.
+        The date part of the string or None if it does not start with a YYYY-MM-DD date.
     """
-    try:
-        return datetime.datetime.fromisoformat(date_string)
-    except (ValueError, TypeError):
-        return None
+    if isinstance(date_string, str) and len(date_string) >= 10 and date_string[4] == '-' and date_string[7] == '-':
+        return date_string[:10]
+    return None
 
 def safe_int_convert(value, default=0):
     """
@@ -54,12 +78,59 @@ def safe_int_convert(value, default=0):
     """
     if value is None:
         return default
+    if type(value) is int:
+        # Already an integer, skip the conversion and exception handling
+        return value
     try:
         return int(value)
     except (ValueError, TypeError):
         return default
 
-def get_report_filename(target_org: str, output_dir: str, extension: str) -> str:
+def _date_alerts_to_dict(date_alerts: list) -> Dict[str, int]:
+    """
+    Convert the accumulated alert counts of a scan date to the dictionary used in the report.
+
+    Args:
+        date_alerts: Alert counts in the slot order of ALERT_COUNT_PROPERTIES.
+
+    Returns:
+        Dictionary with the alert counts and the total of code, secret and dependency alerts.
+    """
+    result = dict(zip(DATE_ALERT_KEYS[:3], date_alerts[:3]))
+    result['total'] = date_alerts[0] + date_alerts[1] + date_alerts[2]
+    result.update(zip(DATE_ALERT_KEYS[3:], date_alerts[3:]))
+    return result
+
+def get_top_alert_repos(repos_alerts: Dict, limit: int) -> tuple[list, list]:
+    """
+    Select the repositories with the most alerts and with the most critical alerts.
+
+    Uses a heap selection instead of sorting all repositories, only the top entries are needed.
+
+    Args:
+        repos_alerts: Dictionary of repository names to their alert counts.
+        limit: Maximum number of repositories in each list.
+
+    Returns:
+        A tuple (top_repos, critical_repos) of (repo_name, repo_data) items:
+        - top_repos: The repositories with the most alerts in total.
+        - critical_repos: The repositories with the most critical code and dependency alerts,
+          only repositories with at least one critical alert are included.
+    """
+    top_repos = heapq.nlargest(limit, repos_alerts.items(), key=lambda x: x[1]['total'])
+    critical_repos = [
+        (repo_name, repo_data)
+        for repo_name, repo_data in heapq.nlargest(
+            limit,
+            repos_alerts.items(),
+            key=lambda x: (x[1].get('code_critical', 0) + x[1].get('dep_critical', 0))
+        )
+        if repo_data.get('code_critical', 0) > 0 or repo_data.get('dep_critical', 0) > 0
+    ]
+    return top_repos, critical_repos
+
+def get_report_filename(target_org: str, output_dir: Union[str, Path], extension: str,
+                        report_time: Optional[datetime.datetime] = None) -> Path:
     """
     Generate a standardized report filename.
 
@@ -67,30 +138,44 @@ def get_report_filename(target_org: str, output_dir: str, extension: str) -> str
         target_org: Target organization name
         output_dir: Directory to save the report
         extension: File extension (e.g., 'json', 'md')
+        report_time: Time the report was generated, the current time if not given
 
     Returns:
         Full path to the report file
     """
-    date_str = datetime.datetime.now().strftime('%Y%m%d')
-    return f"{output_dir}/ghas_report_{target_org}_{date_str}.{extension}"
+    if report_time is None:
+        report_time = datetime.datetime.now()
+    date_str = report_time.strftime(REPORT_FILENAME_DATE_FORMAT)
+    return Path(output_dir) / f"ghas_report_{target_org}_{date_str}.{extension}"
 
-def generate_report(repo_properties: List[Dict], target_org: str, output_dir: str = REPORT_DIR) -> Dict:
+def generate_report(repo_properties: Iterable[Any], target_org: str, output_dir: str = REPORT_DIR,
+                    in_ci: Optional[bool] = None) -> Dict:
     """
     Generate a report from repository properties.
 
+    The properties are processed one repository at a time, so they can be streamed from the API.
+
     Args:
-        repo_properties: List of repository properties.
+        repo_properties: Iterable of repository properties.
         target_org: Target organization name.
         output_dir: Directory to save report files.
+        in_ci: Whether the report runs in CI, read from the CI environment variable if not given.
 
     Returns:
         Dictionary with report statistics.
     """
+    if in_ci is None:
+        in_ci = bool(os.getenv("CI"))
+
+    # Use a single timestamp for the report date and all report files
+    report_time = datetime.datetime.now()
+
     # Create reports directory if it doesn't exist
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
 
     # Initialize counters and data structures
-    total_repos = len(repo_properties)
+    total_repos = 0
     scanned_repos = 0
     repos_with_alerts = 0
 
@@ -115,7 +200,7 @@ def generate_report(repo_properties: List[Dict], target_org: str, output_dir: st
     }
 
     # Dictionary to track secret alerts by type
-    secret_alerts_by_type = defaultdict(int)
+    secret_alerts_by_type = Counter()
 
     # Dictionary to track MCP server runtime types
     runtime_types = defaultdict(int)
@@ -124,68 +209,63 @@ def generate_report(repo_properties: List[Dict], target_org: str, output_dir: st
     unknown_runtime_repos = []
 
     # Dictionary to track alerts by date
-    alerts_by_date = defaultdict(lambda: {
-        'code': 0,
-        'secret': 0,
-        'dependency': 0,
-        'total': 0,
-        'code_critical': 0,
-        'code_high': 0,
-        'code_medium': 0,
-        'code_low': 0,
-        'dependency_critical': 0,
-        'dependency_high': 0,
-        'dependency_moderate': 0,
-        'dependency_low': 0
-    })
+    # Alert counts per scan date, accumulated in the slot order of ALERT_COUNT_PROPERTIES
+    alerts_by_date = {}
 
     # Dictionary to store repositories with alerts
     repos_alerts = {}
 
     # Process each repository's properties
     for repo_prop in repo_properties:
+        total_repos += 1
         repo_name = repo_prop.repository_name
         full_name = f"{target_org}/{repo_name}"
 
-        # Extract properties
-        properties = {prop.property_name: prop.value for prop in repo_prop.properties}
+        # Extract the properties in a single pass, properties that are not set keep their defaults
+        scanned = False
+        scan_date_str = None
+        alert_counts = [0] * len(ALERT_COUNT_PROPERTIES)
+        secret_types_stored = ""
+        runtime_type = "unknown"
+        for prop in repo_prop.properties:
+            name = prop.property_name
+            slot = ALERT_COUNT_SLOTS.get(name)
+            if slot is not None:
+                # Convert inline instead of calling safe_int_convert for every alert count,
+                # None and invalid values keep the default of 0
+                try:
+                    alert_counts[slot] = int(prop.value)
+                except (ValueError, TypeError):
+                    pass
+            elif name == Constants.ScanSettings.GHAS_STATUS_UPDATED:
+                scanned = True
+                scan_date_str = prop.value
+            elif name == Constants.AlertProperties.SECRET_ALERTS_BY_TYPE:
+                secret_types_stored = prop.value
+            elif name == Constants.AlertProperties.MCP_SERVER_RUNTIME:
+                runtime_type = prop.value
+
+        (code_alerts, secret_alerts, dependency_alerts,
+         code_critical, code_high, code_medium, code_low,
+         dep_critical, dep_high, dep_moderate, dep_low) = alert_counts
 
         # Check if repo has been scanned
-        if Constants.ScanSettings.GHAS_STATUS_UPDATED in properties:
+        if scanned:
             scanned_repos += 1
 
-            # Parse scan date
-            scan_date_str = properties.get(Constants.ScanSettings.GHAS_STATUS_UPDATED)
-            scan_date = parse_iso_date(scan_date_str)
-
-            # Get alert counts - use safe conversion to handle None values
-            code_alerts = safe_int_convert(properties.get(Constants.AlertProperties.CODE_ALERTS, 0))
-            secret_alerts = safe_int_convert(properties.get(Constants.AlertProperties.SECRET_ALERTS_TOTAL, 0))
-            dependency_alerts = safe_int_convert(properties.get(Constants.AlertProperties.DEPENDENCY_ALERTS, 0))
-
-            # Get code scanning alert counts by severity
-            code_critical = safe_int_convert(properties.get(Constants.AlertProperties.CODE_ALERTS_CRITICAL, 0))
-            code_high = safe_int_convert(properties.get(Constants.AlertProperties.CODE_ALERTS_HIGH, 0))
-            code_medium = safe_int_convert(properties.get(Constants.AlertProperties.CODE_ALERTS_MEDIUM, 0))
-            code_low = safe_int_convert(properties.get(Constants.AlertProperties.CODE_ALERTS_LOW, 0))
-
-            # Get dependency alert counts by severity
-            dep_critical = safe_int_convert(properties.get(Constants.AlertProperties.DEPENDENCY_ALERTS_CRITICAL, 0))
-            dep_high = safe_int_convert(properties.get(Constants.AlertProperties.DEPENDENCY_ALERTS_HIGH, 0))
-            dep_moderate = safe_int_convert(properties.get(Constants.AlertProperties.DEPENDENCY_ALERTS_MODERATE, 0))
-            dep_low = safe_int_convert(properties.get(Constants.AlertProperties.DEPENDENCY_ALERTS_LOW, 0))
+            # Get the scan date key for the per-date counters
+            date_key = get_date_key(scan_date_str)
 
             # Get secret alert types
-            secret_types_stored = properties.get(Constants.AlertProperties.SECRET_ALERTS_BY_TYPE, "")
             if secret_types_stored and secret_types_stored != "{}":
                 # Use the new parsing function that handles both new format and legacy JSON
                 secret_types = _parse_secret_types_from_storage(secret_types_stored)
-                # Add to type totals
-                for secret_type, count in secret_types.items():
-                    secret_alerts_by_type[secret_type] += safe_int_convert(count)
+                # Add to type totals, legacy JSON values are not guaranteed to be integers
+                secret_alerts_by_type.update({
+                    secret_type: safe_int_convert(count) for secret_type, count in secret_types.items()
+                })
 
             # Get MCP server runtime type
-            runtime_type = properties.get(Constants.AlertProperties.MCP_SERVER_RUNTIME, "unknown")
             if runtime_type is not None:
                 # Handle empty strings as "unknown"
                 if runtime_type == "":
@@ -240,21 +320,12 @@ def generate_report(repo_properties: List[Dict], target_org: str, output_dir: st
                 }
 
             # Track alerts by date
-            if scan_date:
-                date_key = scan_date.strftime('%Y-%m-%d')
-                alerts_by_date[date_key]['code'] += code_alerts
-                alerts_by_date[date_key]['secret'] += secret_alerts
-                alerts_by_date[date_key]['dependency'] += dependency_alerts
-                alerts_by_date[date_key]['total'] += (code_alerts + secret_alerts + dependency_alerts)
-                # Add severity info to alerts_by_date
-                alerts_by_date[date_key]['code_critical'] += code_critical
-                alerts_by_date[date_key]['code_high'] += code_high
-                alerts_by_date[date_key]['code_medium'] += code_medium
-                alerts_by_date[date_key]['code_low'] += code_low
-                alerts_by_date[date_key]['dependency_critical'] += dep_critical
-                alerts_by_date[date_key]['dependency_high'] += dep_high
-                alerts_by_date[date_key]['dependency_moderate'] += dep_moderate
-                alerts_by_date[date_key]['dependency_low'] += dep_low
+            if date_key:
+                date_alerts = alerts_by_date.get(date_key)
+                if date_alerts is None:
+                    alerts_by_date[date_key] = alert_counts
+                else:
+                    alerts_by_date[date_key] = list(map(operator.add, date_alerts, alert_counts))
 
     # Generate summary statistics
     stats = {
@@ -266,6 +337,8 @@ def generate_report(repo_properties: List[Dict], target_org: str, output_dir: st
         'total_secret_alerts': total_secret_alerts,
         'total_dependency_alerts': total_dependency_alerts,
         'total_alerts': total_code_alerts + total_secret_alerts + total_dependency_alerts,
+        # Percentage of scanned repositories, None when the organization has no repositories
+        'scan_coverage': (scanned_repos / total_repos) * 100 if total_repos > 0 else None,
         # Add severity breakdowns
         'code_alerts_by_severity': code_alerts_by_severity,
         'dependency_alerts_by_severity': dependency_alerts_by_severity,
@@ -275,34 +348,33 @@ def generate_report(repo_properties: List[Dict], target_org: str, output_dir: st
         'runtime_types': dict(runtime_types),
         # Add unknown runtime repos list
         'unknown_runtime_repos': unknown_runtime_repos,
-        'alerts_by_date': dict(alerts_by_date),
+        'alerts_by_date': {
+            date_key: _date_alerts_to_dict(date_alerts) for date_key, date_alerts in alerts_by_date.items()
+        },
         'repos_alerts': repos_alerts,
-        'report_date': datetime.datetime.now().isoformat(),
+        'report_date': report_time.isoformat(),
     }
 
     # Write JSON report
-    report_file = get_report_filename(target_org, output_dir, 'json')
+    report_file = get_report_filename(target_org, output_path, 'json', report_time)
 
     # Create a copy of stats for JSON output, excluding sensitive data in CI
     json_stats = stats.copy()
-    if os.getenv("CI"):
+    if in_ci:
         # Remove repository-specific alert data in CI environment to prevent leaking vulnerability info
         json_stats.pop('repos_alerts', None)
 
-    with open(report_file, 'w') as f:
-        json.dump(json_stats, f, indent=2)
+    with open(report_file, 'wb') as f:
+        f.write(orjson.dumps(json_stats, option=orjson.OPT_INDENT_2))
     logging.info(f"JSON report saved to {report_file}")
 
     # Write Markdown report
     summary_file_path = os.getenv("GITHUB_STEP_SUMMARY")
-    md_report_file = get_report_filename(target_org, output_dir, 'md')
-    _write_markdown_report(stats, md_report_file, summary_file_path)
+    md_report_file = get_report_filename(target_org, output_path, 'md', report_time)
+    content = _write_markdown_report(stats, md_report_file, summary_file_path, in_ci, report_time)
     #  when running in GitHub Actions, write the report also to the GITHUB_STEP_SUMMARY file
     if summary_file_path:
         try:
-            with open(md_report_file, "r") as md_file:
-                content = md_file.read()
-
             with open(summary_file_path, "a") as summary_file:
                 summary_file.write(content + "\n\n")
             logging.info("Successfully appended summary to GITHUB_STEP_SUMMARY file")
@@ -312,227 +384,226 @@ def generate_report(repo_properties: List[Dict], target_org: str, output_dir: st
 
     return stats
 
-def _write_markdown_report(stats: Dict, output_file, summary_file_path: str) -> None:
+def _write_markdown_report(stats: Dict, output_file, summary_file_path: str, in_ci: Optional[bool] = None,
+                           report_time: Optional[datetime.datetime] = None) -> str:
     """
     Write a markdown report from statistics.
 
     Args:
         stats: Dictionary with report statistics.
         output_file: File to write the report to.
+        in_ci: Whether the report runs in CI, read from the CI environment variable if not given.
+        report_time: Time the report was generated, the current time if not given.
+
+    Returns:
+        The markdown content that was written.
     """
-    with open(output_file, 'w') as f:
-        f.write(f"# GHAS Security Report - {stats['organization']}\n\n")
-        f.write(f"*Report generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
-
-        f.write("## Summary\n\n")
-        f.write(f"- **Organization:** {stats['organization']}\n")
-        f.write(f"- **Total Repositories:** {stats['total_repositories']}\n")
-        f.write(f"- **Scanned Repositories:** {stats['scanned_repositories']}\n")
-        f.write(f"- **Repositories with Alerts:** {stats['repos_with_alerts']}\n")
-        f.write(f"- **Total Alerts:** {stats['total_alerts']}\n")
-        f.write(f"  - Code Scanning Alerts: {stats['total_code_alerts']}\n")
-        f.write(f"  - Secret Scanning Alerts: {stats['total_secret_alerts']}\n")
-        f.write(f"  - Dependency Alerts: {stats['total_dependency_alerts']}\n\n")
-
-        # Add severity breakdown sections
-        f.write("## Code Scanning Alerts by Severity\n\n")
-        f.write(f"- Critical: {stats['code_alerts_by_severity']['critical']}\n")
-        f.write(f"- High: {stats['code_alerts_by_severity']['high']}\n")
-        f.write(f"- Medium: {stats['code_alerts_by_severity']['medium']}\n")
-        f.write(f"- Low: {stats['code_alerts_by_severity']['low']}\n\n")
-
-        f.write("## Dependency Alerts by Severity\n\n")
-        f.write(f"- Critical: {stats['dependency_alerts_by_severity']['critical']}\n")
-        f.write(f"- High: {stats['dependency_alerts_by_severity']['high']}\n")
-        f.write(f"- Moderate: {stats['dependency_alerts_by_severity']['moderate']}\n")
-        f.write(f"- Low: {stats['dependency_alerts_by_severity']['low']}\n\n")
-
-        # Add section for secret alerts by type
-        f.write("## Secret Scanning Alerts by Type\n\n")
-        if len(stats['secret_alerts_by_type']) > 0:
-            for secret_type, count in sorted(stats['secret_alerts_by_type'].items(), key=lambda x: x[1], reverse=True):
-                f.write(f"- {secret_type}: {count}\n")
-        elif stats['total_secret_alerts'] > 0:
-            f.write("Secrets found but types not categorized.\n")
-        else:
-            f.write("No secret scanning alerts found.\n")
-        f.write("\n")
-
-        # Add section for MCP server runtime types
-        f.write("## MCP Server Runtime Distribution\n\n")
-
-        runtime_types = stats.get('runtime_types', {})
-        if len(runtime_types) > 0:
-            total_runtime_repos = sum(stats['runtime_types'].values())
-            scanned_repositories = stats.get('scanned_repositories', total_runtime_repos)
-
-            f.write(f"*Runtime information is available for {total_runtime_repos} of {scanned_repositories} scanned repositories.*\n\n")
-
-            # Create table
-            f.write("| Runtime Type | Count | Percentage |\n")
-            f.write("|--------------|-------|------------|\n")
-            for runtime_type, count in sorted(runtime_types.items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / total_runtime_repos) * 100 if total_runtime_repos > 0 else 0
-                f.write(f"| {runtime_type} | {count} | {percentage:.1f}% |\n")
-            f.write(f"| **Total Scanned** | **{total_runtime_repos}** | **100.0%** |\n\n")
-
-            # Create mermaid pie chart
-            f.write("```mermaid\n")
-            f.write("pie title MCP Server Runtime Distribution\n")
-            for runtime_type, count in sorted(runtime_types.items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / total_runtime_repos) * 100 if total_runtime_repos > 0 else 0
-                f.write(f'    "{runtime_type}" : {percentage:.1f}\n')
-            f.write("```\n\n")
-
-            # Add collapsible section for latest repos with unknown runtime
-            unknown_repos = stats.get('unknown_runtime_repos', [])
-            if unknown_repos:
-                latest_unknown = sorted(
-                    unknown_repos,
-                    key=lambda x: x.get('scan_date') or '',
-                    reverse=True
-                )[:10]
-                f.write("<details>\n")
-                f.write("<summary>Latest 10 repositories with unknown runtime</summary>\n\n")
-                f.write("| Repository | Last Scanned |\n")
-                f.write("|------------|-------------|\n")
-                for repo in latest_unknown:
-                    f.write(f"| {repo['name']} | {repo.get('scan_date', '')} |\n")
-                f.write("\n</details>\n\n")
-        else:
-            f.write("No MCP server runtime information available.\n\n")
-
-        # Coverage statistics
-        if stats['total_repositories'] > 0:
-            scan_coverage = (stats['scanned_repositories'] / stats['total_repositories']) * 100
-            f.write("## Coverage\n\n")
-            f.write(f"- **Scan Coverage:** {scan_coverage:.1f}%\n")
-
-        # Only show detailed repository section if not running in CI
-        if not (os.getenv("CI")):
-            f.write("\n## Top Repositories with Alerts\n\n")
-            f.write("| Repository | Total Alerts | Code Alerts | Secret Alerts | Dependency Alerts | Last Scanned |\n")
-            f.write("|------------|-------------|------------|--------------|-------------------|-------------|\n")
-
-            # Sort repositories by total alerts
-            top_repos = sorted(
-                stats['repos_alerts'].items(),
-                key=lambda x: x[1]['total'],
-                reverse=True
-            )
-
-            # List top 10 repositories or all if less than 10
-            for repo_name, repo_data in top_repos[:10]:
-                f.write(f"| {repo_name} | {repo_data['total']} | {repo_data['code']} | "
-                        f"{repo_data['secret']} | {repo_data['dependency']} | {repo_data['scan_date']} |\n")
-
-            # Add a section for repositories with most critical alerts
-            f.write("\n## Top Repositories with Critical Alerts\n\n")
-            f.write("| Repository | Critical Code | Critical Dependencies |\n")
-            f.write("|------------|--------------|----------------------|\n")
-
-            # Sort repositories by critical alerts (code + dependency)
-            critical_repos = sorted(
-                stats['repos_alerts'].items(),
-                key=lambda x: (x[1].get('code_critical', 0) + x[1].get('dep_critical', 0)),
-                reverse=True
-            )
+    if in_ci is None:
+        in_ci = bool(os.getenv("CI"))
+    if report_time is None:
+        report_time = datetime.datetime.now()
+
+    # Collect the report in memory and write it with a single call
+    parts = []
+
+    parts.append(f"# GHAS Security Report - {stats['organization']}\n\n")
+    parts.append(f"*Report generated on: {report_time.strftime(REPORT_TIMESTAMP_FORMAT)}*\n\n")
+
+    parts.append("## Summary\n\n")
+    parts.append(f"- **Organization:** {stats['organization']}\n")
+    parts.append(f"- **Total Repositories:** {stats['total_repositories']}\n")
+    parts.append(f"- **Scanned Repositories:** {stats['scanned_repositories']}\n")
+    parts.append(f"- **Repositories with Alerts:** {stats['repos_with_alerts']}\n")
+    parts.append(f"- **Total Alerts:** {stats['total_alerts']}\n")
+    parts.append(f"  - Code Scanning Alerts: {stats['total_code_alerts']}\n")
+    parts.append(f"  - Secret Scanning Alerts: {stats['total_secret_alerts']}\n")
+    parts.append(f"  - Dependency Alerts: {stats['total_dependency_alerts']}\n\n")
+
+    # Add severity breakdown sections
+    parts.append("## Code Scanning Alerts by Severity\n\n")
+    parts.append(f"- Critical: {stats['code_alerts_by_severity']['critical']}\n")
+    parts.append(f"- High: {stats['code_alerts_by_severity']['high']}\n")
+    parts.append(f"- Medium: {stats['code_alerts_by_severity']['medium']}\n")
+    parts.append(f"- Low: {stats['code_alerts_by_severity']['low']}\n\n")
+
+    parts.append("## Dependency Alerts by Severity\n\n")
+    parts.append(f"- Critical: {stats['dependency_alerts_by_severity']['critical']}\n")
+    parts.append(f"- High: {stats['dependency_alerts_by_severity']['high']}\n")
+    parts.append(f"- Moderate: {stats['dependency_alerts_by_severity']['moderate']}\n")
+    parts.append(f"- Low: {stats['dependency_alerts_by_severity']['low']}\n\n")
+
+    # Add section for secret alerts by type
+    parts.append("## Secret Scanning Alerts by Type\n\n")
+    if len(stats['secret_alerts_by_type']) > 0:
+        for secret_type, count in sorted(stats['secret_alerts_by_type'].items(), key=lambda x: x[1], reverse=True):
+            parts.append(f"- {secret_type}: {count}\n")
+    elif stats['total_secret_alerts'] > 0:
+        parts.append("Secrets found but types not categorized.\n")
+    else:
+        parts.append("No secret scanning alerts found.\n")
+    parts.append("\n")
+
+    # Add section for MCP server runtime types
+    parts.append("## MCP Server Runtime Distribution\n\n")
+
+    runtime_types = stats.get('runtime_types', {})
+    if len(runtime_types) > 0:
+        total_runtime_repos = sum(stats['runtime_types'].values())
+        scanned_repositories = stats.get('scanned_repositories', total_runtime_repos)
+
+        parts.append(f"*Runtime information is available for {total_runtime_repos} of {scanned_repositories} scanned repositories.*\n\n")
 
-            # List top 10 repositories with critical alerts
-            for repo_name, repo_data in critical_repos[:10]:
-                if repo_data.get('code_critical', 0) > 0 or repo_data.get('dep_critical', 0) > 0:
-                    f.write(f"| {repo_name} | {repo_data.get('code_critical', 0)} | {repo_data.get('dep_critical', 0)} |\n")
+        # Create table
+        parts.append("| Runtime Type | Count | Percentage |\n")
+        parts.append("|--------------|-------|------------|\n")
+        for runtime_type, count in sorted(runtime_types.items(), key=lambda x: x[1], reverse=True):
+            percentage = (count / total_runtime_repos) * 100 if total_runtime_repos > 0 else 0
+            parts.append(f"| {runtime_type} | {count} | {percentage:.1f}% |\n")
+        parts.append(f"| **Total Scanned** | **{total_runtime_repos}** | **100.0%** |\n\n")
+
+        # Create mermaid pie chart
+        parts.append("```mermaid\n")
+        parts.append("pie title MCP Server Runtime Distribution\n")
+        for runtime_type, count in sorted(runtime_types.items(), key=lambda x: x[1], reverse=True):
+            percentage = (count / total_runtime_repos) * 100 if total_runtime_repos > 0 else 0
+            parts.append(f'    "{runtime_type}" : {percentage:.1f}\n')
+        parts.append("```\n\n")
+
+        # Add collapsible section for latest repos with unknown runtime
+        unknown_repos = stats.get('unknown_runtime_repos', [])
+        if unknown_repos:
+            latest_unknown = sorted(
+                unknown_repos,
+                key=lambda x: x.get('scan_date') or '',
+                reverse=True
+            )[:10]
+            parts.append("<details>\n")
+            parts.append("<summary>Latest 10 repositories with unknown runtime</summary>\n\n")
+            parts.append("| Repository | Last Scanned |\n")
+            parts.append("|------------|-------------|\n")
+            for repo in latest_unknown:
+                parts.append(f"| {repo['name']} | {repo.get('scan_date', '')} |\n")
+            parts.append("\n</details>\n\n")
+    else:
+        parts.append("No MCP server runtime information available.\n\n")
+
+    # Coverage statistics
+    scan_coverage = stats.get('scan_coverage')
+    if scan_coverage is not None:
+        parts.append("## Coverage\n\n")
+        parts.append(f"- **Scan Coverage:** {scan_coverage:.1f}%\n")
+
+    # Only show detailed repository section if not running in CI
+    if not in_ci:
+        parts.append("\n## Top Repositories with Alerts\n\n")
+        parts.append("| Repository | Total Alerts | Code Alerts | Secret Alerts | Dependency Alerts | Last Scanned |\n")
+        parts.append("|------------|-------------|------------|--------------|-------------------|-------------|\n")
+
+        # Select the repositories with the most total and critical alerts
+        top_repos, critical_repos = get_top_alert_repos(stats['repos_alerts'], 10)
+
+        # List top 10 repositories or all if less than 10
+        for repo_name, repo_data in top_repos:
+            parts.append(f"| {repo_name} | {repo_data['total']} | {repo_data['code']} | "
+                         f"{repo_data['secret']} | {repo_data['dependency']} | {repo_data['scan_date']} |\n")
+
+        # Add a section for repositories with most critical alerts
+        parts.append("\n## Top Repositories with Critical Alerts\n\n")
+        parts.append("| Repository | Critical Code | Critical Dependencies |\n")
+        parts.append("|------------|--------------|----------------------|\n")
+
+        # List top 10 repositories with critical alerts
+        for repo_name, repo_data in critical_repos:
+            parts.append(f"| {repo_name} | {repo_data.get('code_critical', 0)} | {repo_data.get('dep_critical', 0)} |\n")
+
+    content = "".join(parts)
+    with open(output_file, 'w') as f:
+        f.write(content)
+    return content
 
-def print_console_summary(stats: Dict) -> None:
+def print_console_summary(stats: Dict, in_ci: Optional[bool] = None) -> None:
     """
     Print a summary of the report to the console.
 
     Args:
         stats: Dictionary with report statistics.
+        in_ci: Whether the report runs in CI, read from the CI environment variable if not given.
     """
-    print("\nGHAS Security Report Summary")
-    print("=" * 30)
-    print(f"Organization: {stats['organization']}")
-    print(f"Total Repositories: {stats['total_repositories']}")
-    print(f"Scanned Repositories: {stats['scanned_repositories']}")
-    print(f"Repositories with Alerts: {stats['repos_with_alerts']}")
-    print(f"Total Alerts: {stats['total_alerts']}")
-    print(f"  - Code Scanning Alerts: {stats['total_code_alerts']}")
-    print(f"  - Secret Scanning Alerts: {stats['total_secret_alerts']}")
-    print(f"  - Dependency Alerts: {stats['total_dependency_alerts']}")
+    if in_ci is None:
+        in_ci = bool(os.getenv("CI"))
+
+    # Collect the lines and write them at once instead of printing line by line
+    lines = []
+    lines.append("\nGHAS Security Report Summary")
+    lines.append("=" * 30)
+    lines.append(f"Organization: {stats['organization']}")
+    lines.append(f"Total Repositories: {stats['total_repositories']}")
+    lines.append(f"Scanned Repositories: {stats['scanned_repositories']}")
+    lines.append(f"Repositories with Alerts: {stats['repos_with_alerts']}")
+    lines.append(f"Total Alerts: {stats['total_alerts']}")
+    lines.append(f"  - Code Scanning Alerts: {stats['total_code_alerts']}")
+    lines.append(f"  - Secret Scanning Alerts: {stats['total_secret_alerts']}")
+    lines.append(f"  - Dependency Alerts: {stats['total_dependency_alerts']}")
 
     # Print severity breakdowns
-    print("\nCode Scanning Alerts by Severity:")
-    print(f"  - Critical: {stats['code_alerts_by_severity']['critical']}")
-    print(f"  - High: {stats['code_alerts_by_severity']['high']}")
-    print(f"  - Medium: {stats['code_alerts_by_severity']['medium']}")
-    print(f"  - Low: {stats['code_alerts_by_severity']['low']}")
-
-    print("\nDependency Alerts by Severity:")
-    print(f"  - Critical: {stats['dependency_alerts_by_severity']['critical']}")
-    print(f"  - High: {stats['dependency_alerts_by_severity']['high']}")
-    print(f"  - Moderate: {stats['dependency_alerts_by_severity']['moderate']}")
-    print(f"  - Low: {stats['dependency_alerts_by_severity']['low']}")
+    lines.append("\nCode Scanning Alerts by Severity:")
+    lines.append(f"  - Critical: {stats['code_alerts_by_severity']['critical']}")
+    lines.append(f"  - High: {stats['code_alerts_by_severity']['high']}")
+    lines.append(f"  - Medium: {stats['code_alerts_by_severity']['medium']}")
+    lines.append(f"  - Low: {stats['code_alerts_by_severity']['low']}")
+
+    lines.append("\nDependency Alerts by Severity:")
+    lines.append(f"  - Critical: {stats['dependency_alerts_by_severity']['critical']}")
+    lines.append(f"  - High: {stats['dependency_alerts_by_severity']['high']}")
+    lines.append(f"  - Moderate: {stats['dependency_alerts_by_severity']['moderate']}")
+    lines.append(f"  - Low: {stats['dependency_alerts_by_severity']['low']}")
 
     # Print secret type breakdown
-    print("\nSecret Scanning Alerts by Type:")
+    lines.append("\nSecret Scanning Alerts by Type:")
     if len(stats['secret_alerts_by_type']) > 0:
         for secret_type, count in sorted(stats['secret_alerts_by_type'].items(), key=lambda x: x[1], reverse=True):
-            print(f"  - {secret_type}: {count}")
+            lines.append(f"  - {secret_type}: {count}")
     elif stats['total_secret_alerts'] > 0:
-        print("  Secrets found but types not categorized.")
+        lines.append("  Secrets found but types not categorized.")
     else:
-        print("  No secret scanning alerts found.")
+        lines.append("  No secret scanning alerts found.")
 
     # Print runtime type breakdown
-    print("\nMCP Server Runtime Distribution:")
+    lines.append("\nMCP Server Runtime Distribution:")
     runtime_types = stats.get('runtime_types', {})
     if len(runtime_types) > 0:
         total_runtime_repos = sum(runtime_types.values())
         scanned_repositories = stats.get('scanned_repositories', total_runtime_repos)
-        print(f"  Runtime information available for {total_runtime_repos} of {scanned_repositories} scanned repositories:")
+        lines.append(f"  Runtime information available for {total_runtime_repos} of {scanned_repositories} scanned repositories:")
         for runtime_type, count in sorted(runtime_types.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / total_runtime_repos) * 100 if total_runtime_repos > 0 else 0
-            print(f"  - {runtime_type}: {count} ({percentage:.1f}%)")
+            lines.append(f"  - {runtime_type}: {count} ({percentage:.1f}%)")
     else:
-        print("  No MCP server runtime information available.")
+        lines.append("  No MCP server runtime information available.")
 
-    # Calculate percentages if possible
-    if stats['total_repositories'] > 0:
-        scan_coverage = (stats['scanned_repositories'] / stats['total_repositories']) * 100
-        print(f"\nScan Coverage: {scan_coverage:.1f}%")
+    # Show the scan coverage if the organization has repositories
+    scan_coverage = stats.get('scan_coverage')
+    if scan_coverage is not None:
+        lines.append(f"\nScan Coverage: {scan_coverage:.1f}%")
 
     # Only show sensitive data if not running in CI
-    if not (os.getenv("CI")):
-        print("\nTop 5 Repositories with Most Alerts:")
-        top_repos = sorted(
-            stats['repos_alerts'].items(),
-            key=lambda x: x[1]['total'],
-            reverse=True
-        )
+    if not in_ci:
+        lines.append("\nTop 5 Repositories with Most Alerts:")
+        top_repos, critical_repos = get_top_alert_repos(stats['repos_alerts'], 5)
 
-        for i, (repo_name, repo_data) in enumerate(top_repos[:5], 1):
-            print(f"{i}. {repo_name}: {repo_data['total']} alerts")
+        for i, (repo_name, repo_data) in enumerate(top_repos, 1):
+            lines.append(f"{i}. {repo_name}: {repo_data['total']} alerts")
 
         # Show top 5 repositories with critical alerts
-        print("\nTop 5 Repositories with Critical Alerts:")
-        critical_repos = sorted(
-            stats['repos_alerts'].items(),
-            key=lambda x: (x[1].get('code_critical', 0) + x[1].get('dep_critical', 0)),
-            reverse=True
-        )
-
-        critical_count = 0
+        lines.append("\nTop 5 Repositories with Critical Alerts:")
         for i, (repo_name, repo_data) in enumerate(critical_repos, 1):
             critical_code = repo_data.get('code_critical', 0)
             critical_dep = repo_data.get('dep_critical', 0)
-            if critical_code > 0 or critical_dep > 0:
-                print(f"{critical_count + 1}. {repo_name}: {critical_code} critical code alerts, {critical_dep} critical dependency alerts")
-                critical_count += 1
-                if critical_count >= 5:
-                    break
+            lines.append(f"{i}. {repo_name}: {critical_code} critical code alerts, {critical_dep} critical dependency alerts")
 
-    print(f"\nDetailed reports saved to {REPORT_DIR}/ directory")
+    lines.append(f"\nDetailed reports saved to {REPORT_DIR}/ directory")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main() -> None:
     """
@@ -540,6 +611,11 @@ def main() -> None:
     """
     start_time = datetime.datetime.now()
 
+    load_dotenv()  # Load environment variables from .env file
+
+    # Only show repository-specific alert data outside of CI
+    in_ci = bool(os.getenv("CI"))
+
     parser = argparse.ArgumentParser(description="Generate GHAS security reports from repository properties")
     parser.add_argument("--target-org", default=Constants.Org.TARGET_ORG,
                         help=f"Target GitHub organization (default: {Constants.Org.TARGET_ORG})")
@@ -570,25 +646,27 @@ def main() -> None:
         # Authentication
         gh = get_github_client(app_id, private_key)
 
-        # Load repository properties
-        logging.info(f"Loading repository properties for organization [{args.target_org}]...")
-        repo_properties = list_all_repository_properties_for_org(gh, args.target_org)
+        # Keep a single HTTP client (and its connection pool) open for all API calls
+        with gh:
+            # Stream the repository properties into the report
+            logging.info(f"Loading repository properties for organization [{args.target_org}]...")
+            repo_properties = iter_repository_properties_for_org(gh, args.target_org)
 
-        logging.info(f"Found properties for [{len(repo_properties)}] repositories in organization [{args.target_org}]")
+            # Generate report
+            stats = generate_report(repo_properties, args.target_org, args.output_dir, in_ci)
 
-        # Generate report
-        stats = generate_report(repo_properties, args.target_org, args.output_dir)
+            logging.info(f"Found properties for [{stats['total_repositories']}] repositories in organization [{args.target_org}]")
 
-        # Print summary to console
-        print_console_summary(stats)
+            # Print summary to console
+            print_console_summary(stats, in_ci)
 
-        # Show GitHub API rate limit
-        show_rate_limit(gh)
+            # Show GitHub API rate limit
+            show_rate_limit(gh)
 
-        # Log execution time
-        end_time = datetime.datetime.now()
-        duration = end_time - start_time
-        logging.info(f"Report generation completed in {duration}")
+            # Log execution time
+            end_time = datetime.datetime.now()
+            duration = end_time - start_time
+            logging.info(f"Report generation completed in {duration}")
 
     except Exception as e:
         logging.error(f"Script failed with an error: [{e}]")
@@ -14,7 +14,7 @@ from src.process_mcp_repos import load_mcp_servers_from_awesome_mcp_servers
 
 class TestAwesomeMcpServersLoader(unittest.TestCase):
     
-    @patch('requests.get')
+    @patch('src.process_mcp_repos.HTTP_SESSION.get')
     def test_load_mcp_servers_from_awesome_mcp_servers_success(self, mock_get):
         # Mock response with sample README content containing GitHub links
         mock_response = MagicMock()
@@ -47,7 +47,33 @@ A curated list of MCP servers and projects.
         self.assertIn("https://github.com/user4/another-project", result)
         self.assertNotIn("https://github.com/user3", result)  # Should not include GitHub profiles
         
-    @patch('requests.get')
+    @patch('src.process_mcp_repos.HTTP_SESSION.get')
+    def test_load_mcp_servers_from_awesome_mcp_servers_deduplicates(self, mock_get):
+        # Mock response where the same repository is linked several times, once with a deeper path
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = """
+- [MCP Server 1](https://github.com/user1/mcp-server-1) - Description
+- [MCP Server 2](https://github.com/user2/mcp-server-2/tree/main/server) - Description
+- [MCP Server 1 again](https://github.com/user1/mcp-server-1) - Duplicate
+- [MCP Server 3](https://github.com/user3/mcp-server-3#readme) - Link to an anchor
+- [MCP Server 4](https://github.com/user4/mcp-server-4?tab=readme-ov-file) - Link with a query string
+- [MCP Server 3 again](https://github.com/user3/mcp-server-3?tab=readme-ov-file#installation) - Duplicate
+"""
+        mock_get.return_value = mock_response
+
+        # Test the function
+        result = load_mcp_servers_from_awesome_mcp_servers()
+
+        # Verify the results keep the first occurrence order and reduce deep links, anchors and query strings to the repository
+        self.assertEqual(result, [
+            "https://github.com/user1/mcp-server-1",
+            "https://github.com/user2/mcp-server-2",
+            "https://github.com/user3/mcp-server-3",
+            "https://github.com/user4/mcp-server-4",
+        ])
+
+    @patch('src.process_mcp_repos.HTTP_SESSION.get')
     def test_load_mcp_servers_from_awesome_mcp_servers_no_links(self, mock_get):
         # Mock response with README content that has no GitHub links
         mock_response = MagicMock()
@@ -67,7 +93,7 @@ No links to servers here.
         # Verify the results
         self.assertEqual(len(result), 0)  # Should find no GitHub repository URLs
         
-    @patch('requests.get')
+    @patch('src.process_mcp_repos.HTTP_SESSION.get')
     def test_load_mcp_servers_from_awesome_mcp_servers_request_error(self, mock_get):
         # Mock a request exception
         mock_get.side_effect = requests.exceptions.RequestException("Failed to fetch URL")
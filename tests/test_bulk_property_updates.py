@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.process_mcp_repos import flush_property_updates, main
+
+
+class TestFlushPropertyUpdates(unittest.TestCase):
+    """Test the bulk property updates queued by process_repository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_gh = Mock()
+        self.bulk_update = self.mock_gh.rest.orgs.custom_properties_for_repos_create_or_update_organization_values
+
+    def test_groups_repositories_with_identical_properties(self):
+        """Test that repositories with the same property values share one API call."""
+        with_config = {"GHAS_Enabled": True, "LastUpdated": "2025-01-01T10:00", "HasDependabotConfig": True}
+        without_config = {"GHAS_Enabled": True, "LastUpdated": "2025-01-01T10:00", "HasDependabotConfig": False}
+        pending = [("repo1", with_config), ("repo2", without_config), ("repo3", dict(with_config))]
+
+        flush_property_updates(self.mock_gh, "test-org", pending)
+
+        self.assertEqual(self.bulk_update.call_count, 2)
+        first_call = self.bulk_update.call_args_list[0].kwargs
+        self.assertEqual(first_call["repository_names"], ["repo1", "repo3"])
+        self.assertIn({"property_name": "HasDependabotConfig", "value": "true"}, first_call["properties"])
+        self.assertEqual(pending, [])
+
+    def test_splits_large_groups_into_batches(self):
+        """Test that no API call updates more than 30 repositories."""
+        properties = {"GHAS_Enabled": True}
+        pending = [(f"repo{i}", properties) for i in range(65)]
+
+        flush_property_updates(self.mock_gh, "test-org", pending)
+
+        self.assertEqual(self.bulk_update.call_count, 3)
+        self.assertEqual(len(self.bulk_update.call_args_list[2].kwargs["repository_names"]), 5)
+
+
+class TestMainWritesQueuedUpdates(unittest.TestCase):
+    """Test that main writes the queued property updates when the processing fails."""
+
+    @patch('sys.argv', ['src.process_mcp_repos', '--num-repos=2'])
+    def test_writes_updates_when_a_worker_fails(self):
+        """Test that updates queued before an exception are still written and saved."""
+        def process_repository(existing_repos_by_name, github_url, gh, target_org, processed_repos, failed_forks,
+                               repo_states, pending_property_updates, *args):
+            if github_url.endswith("/ok"):
+                pending_property_updates.append(("owner__ok", {"GHAS_Enabled": True}))
+                return 1, 0, False, False
+            raise RuntimeError("boom")
+
+        with patch.dict(os.environ, {'GH_APP_ID': 'test-app-id', 'GH_APP_PRIVATE_KEY': 'test-key'}), \
+             patch('src.process_mcp_repos.get_github_client', return_value=MagicMock()), \
+             patch('src.process_mcp_repos.list_all_repositories_for_org', return_value=[]), \
+             patch('src.process_mcp_repos.list_all_repository_properties_for_org', return_value=[]), \
+             patch('src.process_mcp_repos.MCP_SERVER_LOADERS', [lambda: ["https://github.com/owner/ok", "https://github.com/owner/fails"]]), \
+             patch('src.process_mcp_repos.load_known_missing_repos', return_value={}), \
+             patch('src.process_mcp_repos.load_recently_processed_repos', return_value=set()), \
+             patch('src.process_mcp_repos.process_repository', side_effect=process_repository), \
+             patch('src.process_mcp_repos.flush_property_updates', return_value=[("owner__ok", {})]) as mock_flush, \
+             patch('src.process_mcp_repos.save_processed_repos') as mock_save_state, \
+             patch('src.process_mcp_repos.save_known_missing_repos') as mock_save_missing:
+            main()
+
+        mock_flush.assert_called_once()
+        self.assertEqual(mock_flush.call_args.args[2], [("owner__ok", {"GHAS_Enabled": True})])
+        mock_save_state.assert_called_once()
+        self.assertEqual(mock_save_state.call_args.args[1], [("owner__ok", {})])
+        mock_save_missing.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.github import extract_repo_owner_name
+
+
+class TestExtractRepoOwnerName(unittest.TestCase):
+    """Test the extract_repo_owner_name function."""
+
+    def test_plain_repository_url(self):
+        """Test that owner and repo are extracted from a plain repository URL."""
+        self.assertEqual(extract_repo_owner_name("https://github.com/owner/repo"), ("owner", "repo"))
+        self.assertEqual(extract_repo_owner_name("https://GitHub.com/owner/repo/"), ("owner", "repo"))
+
+    def test_git_suffix_is_removed(self):
+        """Test that only a trailing .git suffix is removed from the repo name."""
+        self.assertEqual(extract_repo_owner_name("https://github.com/owner/repo.git"), ("owner", "repo"))
+        self.assertEqual(extract_repo_owner_name("https://github.com/owner/owner.github.io"), ("owner", "owner.github.io"))
+
+    def test_trailing_path_is_ignored(self):
+        """Test that links into a repository still resolve to the repository."""
+        self.assertEqual(extract_repo_owner_name("https://github.com/owner/repo/tree/main/src"), ("owner", "repo"))
+        self.assertEqual(extract_repo_owner_name("https://github.com/owner/repo#readme"), ("owner", "repo"))
+
+    def test_invalid_urls(self):
+        """Test that non GitHub or incomplete URLs are rejected."""
+        self.assertEqual(extract_repo_owner_name("https://gitlab.com/owner/repo"), (None, None))
+        self.assertEqual(extract_repo_owner_name("https://github.com.evil.com/owner/repo"), (None, None))
+        self.assertEqual(extract_repo_owner_name("https://github.com/owner"), (None, None))
+        self.assertEqual(extract_repo_owner_name("github.com/owner/repo"), (None, None))
+        self.assertEqual(extract_repo_owner_name(None), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
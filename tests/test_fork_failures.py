@@ -20,7 +20,7 @@ class TestForkFailures(unittest.TestCase):
         """Test that appropriate failure reasons are returned."""
         # Mock the dependencies
         mock_gh = MagicMock()
-        mock_repos = []
+        mock_repos = {}
 
         # Test with 404 error
         response_mock = MagicMock()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.process_mcp_repos import enable_fork_features, finish_new_forks, update_forked_repo, wait_for_fork_ready, wait_for_new_forks
+
+
+def fork_state(default_branch):
+    """Returns a fork state as returned by batch_fetch_repo_state."""
+    return {"default_branch": default_branch, "head_sha": None, "has_dependabot_config": False}
+
+
+class TestNewForkReadiness(unittest.TestCase):
+    """Test waiting for forks created in this run."""
+
+    @patch('src.process_mcp_repos.time.sleep')
+    @patch('src.process_mcp_repos.batch_fetch_repo_state')
+    def test_polls_until_all_forks_have_a_default_branch(self, mock_batch_fetch, mock_sleep):
+        """Test that only the forks that are not ready yet are polled again."""
+        mock_batch_fetch.side_effect = [
+            {"fork1": fork_state("main"), "fork2": fork_state(None)},
+            {"fork2": fork_state("master")},
+        ]
+
+        result = wait_for_new_forks(MagicMock(), "test-org", ["fork1", "fork2"], timeout_seconds=60)
+
+        self.assertEqual(set(result), {"fork1", "fork2"})
+        self.assertEqual(mock_batch_fetch.call_args_list[1][0][2], ["fork2"])
+        mock_sleep.assert_called_once()
+
+    @patch('src.process_mcp_repos.time.sleep')
+    @patch('src.process_mcp_repos.batch_fetch_repo_state', return_value={})
+    @patch('src.process_mcp_repos.enable_fork_features', return_value=True)
+    def test_forks_that_are_not_ready_are_reported_as_failed(self, mock_enable, mock_batch_fetch, mock_sleep):
+        """Test that forks that never become ready end up in failed_forks."""
+        failed_forks = {}
+
+        with patch('src.process_mcp_repos.FORK_READY_TIMEOUT_SECONDS', 0):
+            dependabot_count, failed_count = finish_new_forks(
+                MagicMock(), "test-org", [("owner/repo", "owner__repo")], failed_forks
+            )
+
+        self.assertEqual((dependabot_count, failed_count), (0, 1))
+        self.assertIn("owner/repo", failed_forks)
+        mock_enable.assert_not_called()
+
+
+class TestForkUpdate(unittest.TestCase):
+    """Test syncing existing forks with their upstream."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_gh = MagicMock()
+
+    @patch('src.process_mcp_repos.time.sleep')
+    def test_up_to_date_fork_is_not_polled(self, mock_sleep):
+        """Test that no polling happens when the fork had nothing to merge."""
+        self.mock_gh.rest.repos.merge_upstream.return_value.parsed_data.merge_type = "none"
+
+        result = update_forked_repo(self.mock_gh, "test-org", "owner__repo", "main", "abc123")
+
+        self.assertEqual(result, "none")
+        self.mock_gh.rest.repos.get_branch.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    @patch('src.process_mcp_repos.time.sleep')
+    def test_polls_until_the_head_changes(self, mock_sleep):
+        """Test that the fork is ready as soon as the branch head moved."""
+        old_head, new_head = MagicMock(), MagicMock()
+        old_head.parsed_data.commit.sha = "abc123"
+        new_head.parsed_data.commit.sha = "def456"
+        self.mock_gh.rest.repos.get_branch.side_effect = [old_head, new_head]
+
+        result = wait_for_fork_ready(self.mock_gh, "test-org", "owner__repo", "main", "abc123")
+
+        self.assertTrue(result)
+        self.assertEqual(self.mock_gh.rest.repos.get_branch.call_count, 2)
+        mock_sleep.assert_called_once_with(0.2)
+
+
+@patch('src.process_mcp_repos.enable_ghas_features')
+@patch('src.process_mcp_repos.check_dependabot_config', return_value=True)
+class TestEnableForkFeaturesDependabot(unittest.TestCase):
+    """Test where enable_fork_features gets the Dependabot config state from."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_gh = MagicMock()
+        self.repo_state = fork_state("main")
+
+    @patch('src.process_mcp_repos.update_forked_repo', return_value="none")
+    def test_uses_prefetched_state_when_nothing_was_merged(self, mock_update, mock_check, mock_enable):
+        """Test that the prefetched state is used when the fork was already up to date."""
+        result = enable_fork_features(self.mock_gh, "test-org", "fork", self.repo_state, pending_property_updates=[])
+
+        self.assertFalse(result)
+        mock_check.assert_not_called()
+
+    @patch('src.process_mcp_repos.update_forked_repo', return_value="fast-forward")
+    def test_checks_again_after_merging_upstream(self, mock_update, mock_check, mock_enable):
+        """Test that a Dependabot config added by the upstream merge is found."""
+        pending_property_updates = []
+
+        result = enable_fork_features(self.mock_gh, "test-org", "fork", self.repo_state, pending_property_updates=pending_property_updates)
+
+        self.assertTrue(result)
+        mock_check.assert_called_once_with(self.mock_gh, "test-org", "fork")
+        self.assertTrue(pending_property_updates[0][1]["HasDependabotConfig"])
+
+    @patch('src.process_mcp_repos.update_forked_repo')
+    def test_uses_prefetched_state_for_new_forks(self, mock_update, mock_check, mock_enable):
+        """Test that the state fetched for a new fork is used without syncing it."""
+        result = enable_fork_features(self.mock_gh, "test-org", "fork", self.repo_state, pending_property_updates=[], sync_with_upstream=False)
+
+        self.assertFalse(result)
+        mock_update.assert_not_called()
+        mock_check.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
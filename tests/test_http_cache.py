@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+import httpx
+import orjson
+from githubkit import GitHub, TokenAuthStrategy
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.http_cache import SQLiteCacheStrategy
+
+TOKEN = "ghs_SECRET123"
+ETAG = '"abc123"'
+
+
+class TestSQLiteCacheStrategy(unittest.TestCase):
+    """Test the SQLiteCacheStrategy class."""
+
+    def setUp(self):
+        """Set up a temporary cache file and a fake GitHub API."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.temp_dir.name) / "cache" / "http_cache.sqlite"
+        self.requests = []
+
+    def tearDown(self):
+        """Clean up the temporary cache file."""
+        self.temp_dir.cleanup()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answers like the GitHub API, with 304 Not Modified for a matching ETag."""
+        self.requests.append(request)
+        headers = {"ETag": ETAG, "Cache-Control": "private, max-age=60", "Vary": "Accept, Authorization"}
+        if request.headers.get("If-None-Match") == ETAG:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, json={"login": "test-user", "id": 1})
+
+    def make_client(self) -> GitHub:
+        """Creates a GitHub client that uses the persistent cache and the fake GitHub API."""
+        return GitHub(
+            TokenAuthStrategy(TOKEN),
+            cache_strategy=SQLiteCacheStrategy(self.cache_path),
+            transport=httpx.MockTransport(self.handle_request)
+        )
+
+    def test_requests_without_client_context(self):
+        """Test that the cache keeps working when githubkit closes the HTTP client after every request."""
+        gh = self.make_client()
+
+        for _ in range(3):
+            response = gh.request("GET", "/user")
+            self.assertEqual(response.status_code, 200)
+
+        # Later requests revalidate the cached response with its ETag
+        self.assertEqual(len(self.requests), 3)
+        self.assertNotIn("If-None-Match", self.requests[0].headers)
+        self.assertEqual(self.requests[1].headers["If-None-Match"], ETAG)
+        self.assertEqual(self.requests[2].headers["If-None-Match"], ETAG)
+
+    def test_cache_shared_across_clients(self):
+        """Test that a new client, like in the next run, revalidates the response cached by the previous one."""
+        self.make_client().request("GET", "/user")
+        with self.make_client() as gh:
+            response = gh.request("GET", "/user")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.requests[-1].headers["If-None-Match"], ETAG)
+
+    def test_token_not_stored(self):
+        """Test that the Authorization header of the requests is not written to the cache file."""
+        gh = self.make_client()
+        gh.request("GET", "/user")
+        self.assertEqual(self.requests[0].headers["Authorization"], f"token {TOKEN}")
+
+        connection = sqlite3.connect(self.cache_path)
+        try:
+            rows = connection.execute("SELECT data FROM cache").fetchall()
+        finally:
+            connection.close()
+
+        self.assertEqual(len(rows), 1)
+        data = rows[0][0] if isinstance(rows[0][0], str) else rows[0][0].decode()
+        self.assertNotIn(TOKEN, data)
+
+        stored_request = orjson.loads(data)["request"]
+        self.assertEqual(stored_request["url"], "https://api.github.com/user")
+        self.assertNotIn("authorization", [name.lower() for name, _ in stored_request["headers"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+import tempfile
+import orjson
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.property_summary import analyze_property_values, generate_json_summary, generate_property_summary_report
+
+
+def make_repo(full_name, properties):
+    """Creates a repository properties object like the one returned by the GitHub API."""
+    return Mock(
+        repository_full_name=full_name,
+        properties=[Mock(property_name=name, value=value) for name, value in properties.items()]
+    )
+
+
+class TestAnalyzePropertyValues(unittest.TestCase):
+    """Test the analyze_property_values function."""
+
+    def test_value_counts_and_examples(self):
+        """Test that values are counted and at most 5 example repositories are kept per value."""
+        all_properties = [make_repo(f"org/repo{i}", {"Runtime": "uv"}) for i in range(7)]
+        all_properties.append(make_repo("org/node", {"Runtime": "npx"}))
+        all_properties.append(make_repo("org/empty", {}))
+
+        # The properties are streamed from the API, so only a single pass over them is allowed
+        result = analyze_property_values(iter(all_properties))
+
+        overall = result['overall_summary']
+        self.assertEqual(overall['total_repositories_analyzed'], 9)
+        self.assertEqual(overall['repositories_with_properties'], 8)
+        self.assertEqual(overall['unique_property_names'], ["Runtime"])
+
+        runtime = result['property_details']["Runtime"]
+        self.assertEqual(runtime['total_repos_with_property'], 8)
+        self.assertEqual(runtime['unique_value_count'], 2)
+        self.assertEqual(runtime['all_unique_values'], ["npx", "uv"])
+        self.assertEqual(runtime['most_common_with_examples'][0], ("uv", 7, [f"org/repo{i}" for i in range(5)]))
+        self.assertEqual(runtime['most_common_with_examples'][1], ("npx", 1, ["org/node"]))
+        self.assertNotIn('numeric_stats', runtime)
+
+    def test_numeric_stats(self):
+        """Test that only numeric values are aggregated and None values are listed first."""
+        all_properties = [
+            make_repo("org/a", {"CodeAlerts": "3"}),
+            make_repo("org/b", {"CodeAlerts": "0"}),
+            make_repo("org/c", {"CodeAlerts": "5"}),
+            make_repo("org/d", {"CodeAlerts": None}),
+            make_repo("org/e", {"CodeAlerts": "-"}),
+            make_repo("org/f", {"CodeAlerts": "unknown"}),
+        ]
+
+        result = analyze_property_values(all_properties)
+
+        code_alerts = result['property_details']["CodeAlerts"]
+        self.assertEqual(code_alerts['all_unique_values'], [None, "-", "0", "3", "5", "unknown"])
+        self.assertEqual(code_alerts['numeric_stats'], {
+            'min': 0.0,
+            'max': 5.0,
+            'avg': 8.0 / 3,
+            'total': 8.0,
+            'count_non_zero': 2,
+            'count_zero': 1
+        })
+
+
+class TestGenerateJsonSummary(unittest.TestCase):
+    """Test the generate_json_summary function."""
+
+    def test_writes_readable_json(self):
+        """Test that the summary is written as JSON with the examples converted to objects."""
+        analysis_results = analyze_property_values([
+            make_repo("org/a", {"GHAS_Enabled": "true", "CodeAlerts": None}),
+            make_repo("org/b", {"GHAS_Enabled": "true", "CodeAlerts": "2"}),
+        ])
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            json_path = generate_json_summary(analysis_results, "test-org", output_dir)
+            with open(json_path, 'rb') as f:
+                json_data = orjson.loads(f.read())
+
+        ghas = json_data['property_details']["GHAS_Enabled"]
+        self.assertEqual(ghas['most_common_with_examples'], [
+            {'value': "true", 'count': 2, 'percentage': 100.0, 'example_repositories': ["org/a", "org/b"]}
+        ])
+        self.assertEqual(json_data['property_details']["CodeAlerts"]['all_unique_values'], [None, "2"])
+        self.assertEqual(json_data['overall_summary']['total_repositories_analyzed'], 2)
+
+    def test_sorts_high_cardinality_values(self):
+        """Test that values of properties not sorted by the analysis are still sorted in the JSON summary."""
+        analysis_results = analyze_property_values([
+            make_repo(f"org/repo{i}", {"Commit": f"sha{i:02d}"}) for i in reversed(range(25))
+        ])
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            json_path = generate_json_summary(analysis_results, "test-org", output_dir)
+            with open(json_path, 'rb') as f:
+                json_data = orjson.loads(f.read())
+
+        self.assertEqual(json_data['property_details']["Commit"]['all_unique_values'], [f"sha{i:02d}" for i in range(25)])
+
+
+class TestGeneratePropertySummaryReport(unittest.TestCase):
+    """Test the generate_property_summary_report function."""
+
+    def test_writes_report_sections(self):
+        """Test that the text report contains the summary, the numeric statistics and the examples."""
+        analysis_results = analyze_property_values([
+            make_repo("org/a", {"CodeAlerts": "1"}),
+            make_repo("org/b", {"CodeAlerts": "1"}),
+        ])
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            report_path = generate_property_summary_report(analysis_results, "test-org", output_dir)
+            with open(report_path) as f:
+                report = f.read()
+
+        self.assertIn("Organization: [test-org]\n", report)
+        self.assertIn("Total repositories analyzed: [2]\n", report)
+        self.assertIn("  Total sum: [2.0]\n", report)
+        self.assertIn("  '1': [2] repositories ([100.0%])\n    Example repositories: [org/a, org/b]\n", report)
+        self.assertIn("All unique values: ['1']\n", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import httpx
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rate_limit import PointsThrottler
+
+
+class TestPointsThrottler(unittest.TestCase):
+    """Test the PointsThrottler class."""
+
+    def test_request_cost(self):
+        """Test that reads and GraphQL queries cost 1 point and other REST requests cost 5 points."""
+        self.assertEqual(PointsThrottler.request_cost(httpx.Request("GET", "https://api.github.com/repos/o/r")), 1)
+        self.assertEqual(PointsThrottler.request_cost(httpx.Request("POST", "https://api.github.com/graphql")), 1)
+        self.assertEqual(PointsThrottler.request_cost(httpx.Request("POST", "https://api.github.com/repos/o/r/forks")), 5)
+        self.assertEqual(PointsThrottler.request_cost(httpx.Request("PATCH", "https://api.github.com/orgs/o/properties/values")), 5)
+
+    @patch('src.rate_limit.time.monotonic')
+    def test_waits_once_points_are_used_up(self, mock_monotonic):
+        """Test that requests wait for the points taken in advance and the bucket refills over time."""
+        mock_monotonic.return_value = 0.0
+        throttler = PointsThrottler(max_concurrency=4, points_per_minute=60)
+
+        # A full bucket sends requests right away
+        self.assertEqual(throttler.reserve(60), 0.0)
+        # An empty bucket refills one point per second here
+        self.assertAlmostEqual(throttler.reserve(5), 5.0)
+        self.assertAlmostEqual(throttler.reserve(5), 10.0)
+
+        # After the wait the taken points are paid back
+        mock_monotonic.return_value = 10.0
+        self.assertEqual(throttler.reserve(0), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
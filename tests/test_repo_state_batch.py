@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+from githubkit.exception import GraphQLFailed
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.github import batch_fetch_repo_state
+
+
+class TestBatchFetchRepoState(unittest.TestCase):
+    """Test the batch_fetch_repo_state function."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_gh = Mock()
+        self.org = "test-org"
+
+    def test_parses_aliased_response(self):
+        """Test that each alias in the GraphQL response is mapped back to its repository name."""
+        self.mock_gh.graphql.request.return_value = {
+            "r0": {
+                "defaultBranchRef": {"name": "main", "target": {"oid": "abc123"}},
+                "dependabotConfig": {"oid": "def456"},
+            },
+            "r1": {
+                "defaultBranchRef": {"name": "master", "target": {"oid": "789abc"}},
+                "dependabotConfig": None,
+            },
+        }
+
+        result = batch_fetch_repo_state(self.mock_gh, self.org, ["owner1__repo1", "owner2__repo2"])
+
+        self.assertEqual(len(result), 2)
+        self.assertTrue(result["owner1__repo1"]["has_dependabot_config"])
+        self.assertEqual(result["owner1__repo1"]["head_sha"], "abc123")
+        self.assertFalse(result["owner2__repo2"]["has_dependabot_config"])
+        self.assertEqual(result["owner2__repo2"]["default_branch"], "master")
+
+        # Verify the repository names are passed as variables, not inlined in the query
+        query, variables = self.mock_gh.graphql.request.call_args[0]
+        self.assertEqual(variables, {"owner": self.org, "name0": "owner1__repo1", "name1": "owner2__repo2"})
+        self.assertNotIn("owner1__repo1", query)
+
+    def test_splits_requests_into_batches(self):
+        """Test that one GraphQL request is made per batch of repositories."""
+        self.mock_gh.graphql.request.return_value = {}
+
+        batch_fetch_repo_state(self.mock_gh, self.org, [f"repo{i}" for i in range(5)], batch_size=2)
+
+        self.assertEqual(self.mock_gh.graphql.request.call_count, 3)
+
+    def test_partial_results_on_graphql_errors(self):
+        """Test that missing repositories are skipped while the rest of the batch is used."""
+        error_response = Mock()
+        error_response.data = {
+            "r0": None,
+            "r1": {
+                "defaultBranchRef": None,
+                "dependabotConfig": None,
+            },
+        }
+        self.mock_gh.graphql.request.side_effect = GraphQLFailed(error_response)
+
+        result = batch_fetch_repo_state(self.mock_gh, self.org, ["missing", "present"])
+
+        self.assertNotIn("missing", result)
+        self.assertIn("present", result)
+        self.assertIsNone(result["present"]["default_branch"])
+
+
+if __name__ == '__main__':
+    unittest.main()
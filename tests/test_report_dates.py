@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.report import generate_report, get_date_key
+from src.constants import Constants
+
+
+def make_repo(repo_name, properties):
+    """Creates a repository properties object like the one returned by the GitHub API."""
+    mock_repo = MagicMock()
+    mock_repo.repository_name = repo_name
+    mock_repo.properties = []
+    for name, value in properties.items():
+        mock_prop = MagicMock()
+        mock_prop.property_name = name
+        mock_prop.value = value
+        mock_repo.properties.append(mock_prop)
+    return mock_repo
+
+
+class TestGetDateKey(unittest.TestCase):
+    """Test the get_date_key function."""
+
+    def test_iso_dates(self):
+        """Test that the date part is taken from ISO date and datetime strings."""
+        self.assertEqual(get_date_key("2024-01-01T12:30:00Z"), "2024-01-01")
+        self.assertEqual(get_date_key("2024-01-01T12:30:00.123456+00:00"), "2024-01-01")
+        self.assertEqual(get_date_key("2024-01-01"), "2024-01-01")
+
+    def test_invalid_dates(self):
+        """Test that values without a leading YYYY-MM-DD date have no key."""
+        self.assertIsNone(get_date_key(None))
+        self.assertIsNone(get_date_key(""))
+        self.assertIsNone(get_date_key("2024/01/01"))
+        self.assertIsNone(get_date_key("yesterday"))
+
+
+class TestAlertsByDate(unittest.TestCase):
+    """Test that generate_report groups the alerts by scan date."""
+
+    def test_alerts_grouped_by_scan_day(self):
+        """Test that scans on the same day are added up and invalid dates are skipped."""
+        repo_properties = [
+            make_repo("repo1", {
+                Constants.ScanSettings.GHAS_STATUS_UPDATED: "2024-01-01T08:00:00Z",
+                Constants.AlertProperties.CODE_ALERTS: "2",
+                Constants.AlertProperties.SECRET_ALERTS_TOTAL: "1",
+            }),
+            make_repo("repo2", {
+                Constants.ScanSettings.GHAS_STATUS_UPDATED: "2024-01-01T20:00:00+00:00",
+                Constants.AlertProperties.DEPENDENCY_ALERTS: "3",
+            }),
+            make_repo("repo3", {
+                Constants.ScanSettings.GHAS_STATUS_UPDATED: "not a date",
+                Constants.AlertProperties.CODE_ALERTS: "5",
+            }),
+        ]
+
+        # The properties are streamed from the API, so only a single pass over them is allowed
+        stats = generate_report(iter(repo_properties), "test-org", "test-output")
+
+        self.assertEqual(stats['total_repositories'], 3)
+        self.assertEqual(stats['scanned_repositories'], 3)
+        self.assertEqual(stats['scan_coverage'], 100.0)
+        self.assertEqual(list(stats['alerts_by_date']), ["2024-01-01"])
+        self.assertEqual(stats['alerts_by_date']["2024-01-01"], {
+            'code': 2,
+            'secret': 1,
+            'dependency': 3,
+            'total': 6,
+            'code_critical': 0,
+            'code_high': 0,
+            'code_medium': 0,
+            'code_low': 0,
+            'dependency_critical': 0,
+            'dependency_high': 0,
+            'dependency_moderate': 0,
+            'dependency_low': 0
+        })
+
+    def test_severity_counts_grouped_by_scan_day(self):
+        """Test that the severity counts of several repositories are added up per day."""
+        repo_properties = [
+            make_repo(f"repo{i}", {
+                Constants.ScanSettings.GHAS_STATUS_UPDATED: "2024-02-03T10:00:00Z",
+                Constants.AlertProperties.CODE_ALERTS_CRITICAL: "1",
+                Constants.AlertProperties.DEPENDENCY_ALERTS_LOW: str(i),
+            })
+            for i in range(3)
+        ]
+
+        stats = generate_report(repo_properties, "test-org", "test-output")
+
+        date_alerts = stats['alerts_by_date']["2024-02-03"]
+        self.assertEqual(date_alerts['code_critical'], 3)
+        self.assertEqual(date_alerts['dependency_low'], 3)
+        self.assertEqual(date_alerts['total'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import os
+import subprocess
 import sys
 import unittest
 from unittest.mock import MagicMock, patch
@@ -13,9 +14,9 @@ class TestReportMainExitsOnError(unittest.TestCase):
     """Test that report.main() exits with code 1 on error."""
 
     @patch('src.report.get_github_client')
-    @patch('src.report.list_all_repository_properties_for_org')
+    @patch('src.report.iter_repository_properties_for_org')
     def test_main_exits_on_api_error(self, mock_list_props, mock_get_client):
-        """Test that main() calls sys.exit(1) when list_all_repository_properties_for_org raises."""
+        """Test that main() calls sys.exit(1) when iter_repository_properties_for_org raises."""
         mock_get_client.return_value = MagicMock()
         mock_list_props.side_effect = AttributeError(
             "'OrgsClient' object has no attribute 'list_custom_properties_values_for_repos'"
@@ -30,6 +31,32 @@ class TestReportMainExitsOnError(unittest.TestCase):
         self.assertEqual(ctx.exception.code, 1)
 
 
+class TestReportImport(unittest.TestCase):
+    """Test that importing the report module has no side effects."""
+
+    def test_import_does_not_load_dotenv(self):
+        """Test that importing src.report neither loads the .env file nor imports the analyze script."""
+        code = (
+            "import sys, dotenv\n"
+            "dotenv.load_dotenv = lambda *args, **kwargs: sys.exit('load_dotenv called')\n"
+            "import src.report\n"
+            "assert 'src.analyze' not in sys.modules, 'src.analyze imported'\n"
+        )
+        project_root = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_main_loads_dotenv(self):
+        """Test that main() loads the .env file."""
+        with patch('src.report.load_dotenv') as mock_load_dotenv:
+            with patch.dict(os.environ, {}, clear=True):
+                with patch('sys.argv', ['report']):
+                    from src.report import main
+                    main()
+
+        mock_load_dotenv.assert_called_once()
+
 class TestListAllRepositoryPropertiesForOrg(unittest.TestCase):
     """Test that list_all_repository_properties_for_org uses the correct API method."""
 
@@ -11,6 +11,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.report import _write_markdown_report
+from src.functions import _parse_secret_types_from_storage
 
 class TestSecretTypesReport(unittest.TestCase):
     """Test the secret types reporting functionality."""
@@ -120,5 +121,26 @@ class TestSecretTypesReport(unittest.TestCase):
         self.assertIn("No secret scanning alerts found", content)
         self.assertNotIn("Secrets found but types not categorized", content)
 
+class TestParseSecretTypesFromStorage(unittest.TestCase):
+    """Test parsing the stored secret types property value."""
+
+    def test_storage_format(self):
+        """Test that the compact storage format is parsed with escaped characters restored."""
+        self.assertEqual(
+            _parse_secret_types_from_storage("github_personal_access_token:5,type_COLON_x:2"),
+            {"github_personal_access_token": 5, "type:x": 2}
+        )
+
+    def test_legacy_json_format(self):
+        """Test that the legacy JSON format is still parsed."""
+        self.assertEqual(_parse_secret_types_from_storage('{"aws_access_key_id": 3}'), {"aws_access_key_id": 3})
+        self.assertEqual(_parse_secret_types_from_storage("{}"), {})
+
+    def test_invalid_legacy_json(self):
+        """Test that invalid legacy JSON results in no secret types."""
+        self.assertEqual(_parse_secret_types_from_storage("{not json}"), {})
+        self.assertEqual(_parse_secret_types_from_storage(""), {})
+        self.assertEqual(_parse_secret_types_from_storage(None), {})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import Mock
+import datetime
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.process_mcp_repos import (
+    collect_unique_sources, load_known_missing_repos, load_recently_processed_repos, save_known_missing_repos,
+    save_processed_repos, select_repos_to_process
+)
+
+
+class TestCollectUniqueSources(unittest.TestCase):
+    """Test the collect_unique_sources function."""
+
+    def test_keeps_first_url_per_source_repository(self):
+        """Test that different URLs for the same repository are collapsed to the first one."""
+        github_urls = [
+            "https://github.com/owner/repo",
+            "https://github.com/other/project",
+            "https://github.com/Owner/Repo.git",
+            "https://github.com/owner/repo/tree/main/server",
+        ]
+
+        result = collect_unique_sources(github_urls)
+
+        self.assertEqual(result, ["https://github.com/owner/repo", "https://github.com/other/project"])
+
+    def test_skips_unparseable_urls(self):
+        """Test that URLs without an owner/repo are dropped."""
+        result = collect_unique_sources(["https://example.com/owner/repo", "https://github.com/owner"])
+
+        self.assertEqual(result, [])
+
+    def test_skips_known_missing_repositories(self):
+        """Test that source repositories that returned 404 before are not processed again."""
+        known_missing_repos = {"owner/gone": "2025-01-01"}
+
+        result = collect_unique_sources(["https://github.com/Owner/Gone", "https://github.com/owner/repo"], known_missing_repos)
+
+        self.assertEqual(result, ["https://github.com/owner/repo"])
+
+
+class TestKnownMissingRepos(unittest.TestCase):
+    """Test persisting the source repositories that could not be found."""
+
+    def test_round_trip_drops_expired_entries(self):
+        """Test that saved entries are loaded again until they are older than the TTL."""
+        today = datetime.date.today()
+        known_missing_repos = {
+            "owner/recent": today.isoformat(),
+            "owner/expired": (today - datetime.timedelta(days=31)).isoformat(),
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "cache" / "known_missing_repos.json"
+            save_known_missing_repos(cache_path, known_missing_repos)
+            result = load_known_missing_repos(cache_path, ttl_days=30)
+
+        self.assertEqual(result, {"owner/recent": today.isoformat()})
+
+    def test_missing_file_returns_empty_dict(self):
+        """Test that a first run without a cache file starts empty."""
+        self.assertEqual(load_known_missing_repos(Path("/nonexistent/known_missing_repos.json"), ttl_days=30), {})
+
+
+class TestProcessingState(unittest.TestCase):
+    """Test persisting the forks processed by previous runs."""
+
+    def test_round_trip_drops_old_runs(self):
+        """Test that forks are only skipped while their last run is recent."""
+        recent = datetime.datetime.now().isoformat(timespec="seconds")
+        old = (datetime.datetime.now() - datetime.timedelta(days=8)).isoformat(timespec="seconds")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / "cache" / "processing_state.sqlite"
+            save_processed_repos(state_path, [
+                ("Owner__Recent", {"GHAS_Enabled": True, "LastUpdated": recent, "HasDependabotConfig": False}),
+                ("owner__old", {"GHAS_Enabled": True, "LastUpdated": old, "HasDependabotConfig": True}),
+            ])
+            result = load_recently_processed_repos(state_path, max_age_days=7)
+
+        self.assertEqual(result, {"owner__recent"})
+
+    def test_missing_state_returns_empty_set(self):
+        """Test that a first run without a state file starts empty."""
+        self.assertEqual(load_recently_processed_repos(Path("/nonexistent/processing_state.sqlite"), max_age_days=7), set())
+
+class TestSelectReposToProcess(unittest.TestCase):
+    """Test skipping recently processed forks before the processing loop."""
+
+    def make_properties(self, repository_name, **values):
+        """Creates an org property listing entry like list_all_repository_properties_for_org returns."""
+        properties = []
+        for property_name, value in values.items():
+            prop = Mock()
+            prop.property_name = property_name
+            prop.value = value
+            properties.append(prop)
+        return Mock(repository_name=repository_name, properties=properties)
+
+    def test_skips_recently_processed_forks(self):
+        """Test that only forks without recent processing are kept."""
+        recent = datetime.datetime.now().isoformat(timespec="seconds")
+        old = (datetime.datetime.now() - datetime.timedelta(days=30)).isoformat(timespec="seconds")
+        existing_repos_by_name = {"test-org/owner__recent": Mock(), "test-org/owner__old": Mock()}
+        existing_repos_properties = [
+            self.make_properties("owner__recent", LastUpdated=recent),
+            self.make_properties("owner__old", LastUpdated=old),
+        ]
+        processed_repos = set()
+
+        result = select_repos_to_process(
+            ["https://github.com/owner/recent", "https://github.com/owner/old", "https://github.com/owner/new"],
+            existing_repos_by_name, existing_repos_properties, "test-org", processed_repos
+        )
+
+        self.assertEqual(result, ["https://github.com/owner/old", "https://github.com/owner/new"])
+        self.assertEqual(processed_repos, {"owner/recent"})
+
+    def test_reprocesses_forks_with_invalid_last_updated(self):
+        """Test that a fork with an invalid LastUpdated value is processed again and a warning is logged."""
+        existing_repos_by_name = {"test-org/owner__corrupt": Mock()}
+        existing_repos_properties = [self.make_properties("owner__corrupt", LastUpdated="not a timestamp")]
+        processed_repos = set()
+
+        with self.assertLogs(level="WARNING") as logs:
+            result = select_repos_to_process(
+                ["https://github.com/owner/corrupt"],
+                existing_repos_by_name, existing_repos_properties, "test-org", processed_repos
+            )
+
+        self.assertEqual(result, ["https://github.com/owner/corrupt"])
+        self.assertEqual(processed_repos, set())
+        self.assertIn("[not a timestamp] for [test-org/owner__corrupt]", logs.output[0])
+
+
+
+if __name__ == '__main__':
+    unittest.main()